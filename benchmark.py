@@ -0,0 +1,166 @@
+"""
+Benchmark Model Versions for Turbofan Engine RUL Prediction
+
+Compares registry model versions (e.g. the XGBoost baseline and a
+sequence-window model) side by side on the FD001 test set: accuracy,
+full-batch inference throughput, single-engine request latency and the
+latency of one new reading scored on history from a feature store,
+using the same feature preparation as the prediction service.
+
+With --explain, also times TreeSHAP explanations (exact and approximate,
+cold and warm cache) for 1 and 10,000 rows of each XGBoost version.
+
+Usage:
+    python benchmark.py --versions baseline v20251119-142311
+    python benchmark.py --explain
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import predict
+from explain import ContributionExplainer
+from features import FeatureStore, RAW_COLS
+from model_registry import ModelRegistry, MODEL_DIR, REGISTRY_DIR
+from predict import prepare_features, predict_rows
+
+DATA_DIR = Path('data/CMaps')
+DATASET = 'FD001'
+
+
+def load_test_data() -> pd.DataFrame:
+    """Load the test set with its true RUL per cycle"""
+    col_names = (['unit_id', 'time_cycles'] + [f'setting_{i}' for i in range(1, 4)]
+                 + [f'sensor_{i}' for i in range(1, 22)])
+    test_df = pd.read_csv(DATA_DIR / f'test_{DATASET}.txt', sep='\\s+', header=None, names=col_names)
+    truth = pd.read_csv(DATA_DIR / f'RUL_{DATASET}.txt', sep='\\s+', header=None, names=['RUL'])
+
+    max_cycle = test_df.groupby('unit_id')['time_cycles'].transform('max')
+    rul_at_end = test_df['unit_id'].map(dict(zip(sorted(test_df['unit_id'].unique()), truth['RUL'])))
+    test_df['RUL'] = rul_at_end + (max_cycle - test_df['time_cycles'])
+    return test_df
+
+
+def time_call(fn, repeats: int) -> float:
+    """Median wall time of fn() in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def benchmark_version(state, test_df: pd.DataFrame, repeats: int) -> dict:
+    """Accuracy and latency of one loaded model version"""
+    def score(df):
+        return np.maximum(0, predict_rows(state, df)[0])
+
+    preds = score(test_df)
+    errors = preds - test_df['RUL'].to_numpy()
+    last = test_df.groupby('unit_id')['time_cycles'].transform('max') == test_df['time_cycles']
+
+    # One request carrying a single engine's full history
+    unit_df = test_df[test_df['unit_id'] == test_df['unit_id'].iloc[0]]
+
+    batch_seconds = time_call(lambda: score(test_df), repeats)
+    return {
+        'version': state.version,
+        'model_type': state.metadata.get('model_type'),
+        'rmse': float(np.sqrt(np.mean(errors ** 2))),
+        'mae': float(np.mean(np.abs(errors))),
+        'rmse_last_cycle': float(np.sqrt(np.mean(errors[last.to_numpy()] ** 2))),
+        'batch_ms': batch_seconds * 1000,
+        'batch_us_per_row': batch_seconds * 1e6 / len(test_df),
+        'single_engine_ms': time_call(lambda: score(unit_df), repeats) * 1000,
+        'single_reading_ms': benchmark_single_reading(state, unit_df, repeats) * 1000,
+    }
+
+
+def benchmark_single_reading(state, unit_df: pd.DataFrame, repeats: int) -> float:
+    """Median seconds to score an engine's last reading on history from a feature store"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeatureStore(Path(tmp), sensors=[])
+        store.append(unit_df.iloc[:-1][RAW_COLS])
+        reading = unit_df.iloc[[-1]][RAW_COLS]
+
+        # predict_rows reads history from the service's store
+        previous, predict.feature_store = predict.feature_store, store
+        try:
+            return time_call(lambda: predict_rows(state, reading), repeats)
+        finally:
+            predict.feature_store = previous
+
+
+def benchmark_explanations(state, test_df: pd.DataFrame, repeats: int) -> list:
+    """Explanation latency for 1 and 10k rows, exact/approximate, cold/warm cache"""
+    X = prepare_features(test_df, state.config)
+    results = []
+    for n_rows in (1, 10_000):
+        X_n = X.iloc[np.arange(n_rows) % len(X)]
+        for approximate in (False, True):
+            explainer = ContributionExplainer()
+            cold = time_call(lambda: (explainer.clear(),
+                                      explainer.explain(state.model, X_n, state.version, approximate)),
+                             1 if n_rows > 1 else repeats)
+            warm = time_call(lambda: explainer.explain(state.model, X_n, state.version, approximate),
+                             repeats)
+            results.append({
+                'rows': n_rows,
+                'method': 'approximate' if approximate else 'exact',
+                'cold_ms': cold * 1000,
+                'warm_ms': warm * 1000,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model versions side by side")
+    parser.add_argument('--versions', nargs='+', default=None,
+                        help="Registry versions to compare (default: active version)")
+    parser.add_argument('--repeats', type=int, default=10, help="Timing repetitions")
+    parser.add_argument('--explain', action='store_true',
+                        help="Also benchmark TreeSHAP explanations of XGBoost versions")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(REGISTRY_DIR, fallback_dir=MODEL_DIR)
+    versions = args.versions or [registry.active_version()]
+    test_df = load_test_data()
+
+    print("=" * 80)
+    print(f"MODEL BENCHMARK - {DATASET} test set ({len(test_df)} rows, "
+          f"{test_df['unit_id'].nunique()} engines)")
+    print("=" * 80)
+
+    results = [benchmark_version(registry.load(v), test_df, args.repeats) for v in versions]
+
+    header = (f"{'Version':<20} {'Type':<12} {'RMSE':>8} {'MAE':>8} {'RMSE@last':>10} "
+              f"{'Batch ms':>10} {'µs/row':>8} {'1-engine ms':>12} {'1-reading ms':>13}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['version']:<20} {r['model_type']:<12} {r['rmse']:>8.2f} {r['mae']:>8.2f} "
+              f"{r['rmse_last_cycle']:>10.2f} {r['batch_ms']:>10.1f} {r['batch_us_per_row']:>8.2f} "
+              f"{r['single_engine_ms']:>12.2f} {r['single_reading_ms']:>13.2f}")
+
+    if args.explain:
+        print("\nEXPLANATIONS (pred_contribs)")
+        header = f"{'Version':<20} {'Rows':>6} {'Method':<12} {'Cold ms':>10} {'Warm ms':>10}"
+        print(header)
+        print("-" * len(header))
+        for version in versions:
+            state = registry.load(version)
+            if not hasattr(state.model, 'get_booster'):
+                continue
+            for r in benchmark_explanations(state, test_df, args.repeats):
+                print(f"{version:<20} {r['rows']:>6} {r['method']:<12} "
+                      f"{r['cold_ms']:>10.1f} {r['warm_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -58,7 +58,7 @@ echo "[4/6] Building Docker image..."
 gcloud builds submit --tag ${IMAGE_NAME} ..
 echo "✓ Docker image built and pushed to GCR"
 
-# Deploy to Cloud Run
+# Deploy to Cloud Run (admin endpoints stay disabled unless ADMIN_TOKEN is set)
 echo ""
 echo "[5/6] Deploying to Cloud Run..."
 gcloud run deploy ${SERVICE_NAME} \
@@ -72,7 +72,7 @@ gcloud run deploy ${SERVICE_NAME} \
     --max-instances 10 \
     --min-instances 0 \
     --allow-unauthenticated \
-    --set-env-vars "ENVIRONMENT=production" \
+    --set-env-vars "ENVIRONMENT=production${ADMIN_TOKEN:+,ADMIN_TOKEN=${ADMIN_TOKEN}}" \
     --no-cpu-throttling \
     --concurrency 80
 
@@ -0,0 +1,609 @@
+"""
+Feature Engineering and Feature Store for Turbofan Engine RUL Prediction
+
+``add_rolling_features`` is the single implementation of the engineered
+features, shared by training and the prediction service.
+
+``FeatureStore`` persists raw readings plus rolling features for every
+sensor (or a chosen subset, or none), keyed by ``unit_id``/``time_cycles``.
+Data lives in immutable columnar segments (one memory-mapped ``.npy`` file
+per column) sorted by unit and cycle, each with a per-unit offset index,
+so lookups of a unit's cycle range are two binary searches per segment.
+New cycles are appended incrementally: only the rows that arrive are
+engineered, using the last ``window - 1`` stored cycles of their unit as
+history. Segments are merged on a background thread, off the append path.
+
+Stored rolling features are tagged with a hash of ``add_rolling_features``
+and the window. A store opened with a different one is rebuilt from its raw
+columns, so changing the feature code never leaves stale features behind;
+raw-only stores are unaffected by feature code changes. ``sync``
+likewise rebuilds a store whose stored readings no longer match its source.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Column layout of the C-MAPSS readings
+INDEX_COLS = ['unit_id', 'time_cycles']
+SETTING_COLS = ['setting_1', 'setting_2', 'setting_3']
+SENSOR_COLS = [f'sensor_{i}' for i in range(1, 22)]
+RAW_COLS = INDEX_COLS + SETTING_COLS + SENSOR_COLS
+
+ROLLING_WINDOW = 5
+
+# Buffered rows are written as a segment once this many accumulate
+FLUSH_ROWS = 4096
+
+# Segments are merged once a store has more than this many
+MAX_SEGMENTS = 32
+
+MANIFEST_FILE = 'manifest.json'
+
+# Sorted unit_ids with the first and last cycle to read of each
+CycleRanges = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def feature_version(window: int, columns: List[str]) -> str:
+    """Hash of the stored columns and, if rolling features are stored, their code and window"""
+    layout = {'columns': columns}
+    digest = hashlib.sha256()
+    if set(columns) - set(RAW_COLS):
+        digest.update(inspect.getsource(add_rolling_features).encode())
+        layout['window'] = window
+    digest.update(json.dumps(layout).encode())
+    return digest.hexdigest()[:16]
+
+# ============================================================================
+# FEATURE ENGINEERING
+# ============================================================================
+
+def rolling_feature_names(sensor_cols: Iterable[str]) -> List[str]:
+    """Names of the rolling features for the given sensors, in model order"""
+    names = []
+    for sensor in sensor_cols:
+        names += [f'{sensor}_rolling_mean', f'{sensor}_rolling_std']
+    return names
+
+
+def add_rolling_features(df, sensor_cols, window=ROLLING_WINDOW):
+    """Add rolling mean and std features for sensors"""
+    sensor_cols = list(sensor_cols)
+    values = df[sensor_cols].to_numpy(dtype=np.float64)
+    n_rows = len(values)
+
+    # Rows of each unit next to each other, keeping their order within the unit
+    order = np.argsort(df['unit_id'].to_numpy(), kind='stable')
+    units = df['unit_id'].to_numpy()[order]
+    positions = np.arange(n_rows)
+    new_unit = np.ones(n_rows, dtype=bool)
+    new_unit[1:] = units[1:] != units[:-1]
+    starts = np.maximum.accumulate(np.where(new_unit, positions, 0))
+
+    # (rows, window, sensors) view of each row's window; rows before the unit starts are masked
+    lags = np.arange(window)
+    rows = positions[:, None] - lags[None, :]
+    in_unit = rows >= starts[:, None]
+    windows = values[order][np.maximum(rows, 0)]
+    valid = in_unit[:, :, None] & ~np.isnan(windows)
+    windows = np.where(valid, windows, 0.0)
+
+    # NaN readings are skipped like pandas' rolling; empty windows stay NaN until fillna
+    count = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = windows.sum(axis=1) / count
+        sq_dev = np.where(valid, windows - mean[:, None, :], 0.0) ** 2
+        std = np.sqrt(sq_dev.sum(axis=1) / (count - 1))
+
+    features = {}
+    for i, sensor in enumerate(sensor_cols):
+        features[f'{sensor}_rolling_mean'] = np.empty(n_rows)
+        features[f'{sensor}_rolling_mean'][order] = mean[:, i]
+        features[f'{sensor}_rolling_std'] = np.empty(n_rows)
+        features[f'{sensor}_rolling_std'][order] = std[:, i]
+
+    df_roll = pd.concat([df.drop(columns=[c for c in features if c in df.columns]),
+                         pd.DataFrame(features, index=df.index)], axis=1)
+
+    # Fill NaN in rolling std with 0
+    df_roll = df_roll.fillna(0)
+
+    return df_roll
+
+# ============================================================================
+# FEATURE STORE
+# ============================================================================
+
+def _dtype(col: str):
+    return np.int64 if col in INDEX_COLS else np.float64
+
+
+def _row_keys(data) -> np.ndarray:
+    """One int64 key per unit_id/time_cycles pair of a frame or column arrays"""
+    units = np.asarray(data['unit_id'], dtype=np.int64)
+    return (units << 32) + np.asarray(data['time_cycles'], dtype=np.int64)
+
+
+def _bounds(start_cycle: Optional[int], end_cycle: Optional[int]) -> Tuple[int, int]:
+    """Inclusive int64 cycle bounds, open ends as the extreme values"""
+    return (np.iinfo(np.int64).min if start_cycle is None else int(start_cycle),
+            np.iinfo(np.int64).max if end_cycle is None else int(end_cycle))
+
+
+def _range_mask(units: np.ndarray, cycles: np.ndarray, ranges: Optional[CycleRanges],
+                start_cycle: Optional[int] = None, end_cycle: Optional[int] = None) -> np.ndarray:
+    """Rows within their unit's (start_cycle, end_cycle) range, or one range for all units"""
+    if ranges is None:
+        lo, hi = _bounds(start_cycle, end_cycle)
+        return (cycles >= lo) & (cycles <= hi)
+    range_units, lo, hi = ranges
+    if not len(range_units):
+        return np.zeros(len(units), dtype=bool)
+    pos = np.minimum(np.searchsorted(range_units, units), len(range_units) - 1)
+    return (range_units[pos] == units) & (cycles >= lo[pos]) & (cycles <= hi[pos])
+
+
+def _bisect(values: np.ndarray, start: np.ndarray, stop: np.ndarray, targets: np.ndarray,
+            side: str = 'left') -> np.ndarray:
+    """searchsorted of each target within its own sorted slice values[start:stop]"""
+    lo, hi = start.copy(), stop.copy()
+    active = np.flatnonzero(lo < hi)
+    while len(active):
+        mid = (lo[active] + hi[active]) // 2
+        if side == 'left':
+            right = values[mid] < targets[active]
+        else:
+            right = values[mid] <= targets[active]
+        lo[active[right]] = mid[right] + 1
+        hi[active[~right]] = mid[~right]
+        active = active[lo[active] < hi[active]]
+    return lo
+
+
+def _concat_ranges(start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    """Row numbers of all [start, stop) ranges, concatenated"""
+    lengths = stop - start
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(lengths.sum(), dtype=np.int64) + np.repeat(start - offsets, lengths)
+
+
+class _Segment:
+    """One immutable, sorted columnar segment of the store"""
+
+    def __init__(self, path: Path, columns: List[str]):
+        self.path = path
+        self.columns = {col: np.load(path / f'{col}.npy', mmap_mode='r') for col in columns}
+        self.units = np.load(path / 'units.npy')
+        self.offsets = np.load(path / 'offsets.npy')
+
+    def row_ranges(self, units: np.ndarray, lo: np.ndarray,
+                   hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """[start, stop) rows of each unit's cycles in [lo, hi] (empty for absent units)"""
+        pos = np.searchsorted(self.units, units)
+        found = np.minimum(pos, len(self.units) - 1)
+        present = (pos < len(self.units)) & (self.units[found] == units)
+        first = np.where(present, self.offsets[found], 0)
+        last = np.where(present, self.offsets[found + 1], 0)
+
+        # Cycles are sorted within each unit's offset slice
+        cycles = self.columns['time_cycles']
+        start = _bisect(cycles, first, last, lo, side='left')
+        stop = _bisect(cycles, start, last, hi, side='right')
+        return start, stop
+
+    def last_cycles(self) -> Dict[int, int]:
+        """Latest stored cycle of every unit in the segment"""
+        last = self.columns['time_cycles'][self.offsets[1:] - 1]
+        return dict(zip(self.units.tolist(), last.tolist()))
+
+
+class FeatureStore:
+    """Local columnar store of engineered features per unit_id/time_cycles.
+
+    Appended rows go to an append-only in-memory buffer and are written as
+    a new segment once ``flush_rows`` accumulate (or on ``flush()``).
+    Readers work on one snapshot of (segments, buffer), which writers
+    replace atomically; segments are merged on a background thread once
+    there are more than ``MAX_SEGMENTS``. ``sensors`` selects the sensors
+    with stored rolling features (none keeps raw readings only).
+    """
+
+    def __init__(self, root: Path, window: int = ROLLING_WINDOW, flush_rows: int = FLUSH_ROWS,
+                 sensors: Iterable[str] = SENSOR_COLS):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.flush_rows = flush_rows
+        self._lock = threading.Lock()
+        self._buffer: Optional[Dict[str, np.ndarray]] = None
+        self._buffered = 0
+        self._compactor: Optional[threading.Thread] = None
+
+        self.window = window
+        self.sensors = list(sensors)
+        self.columns = RAW_COLS + rolling_feature_names(self.sensors)
+        version = feature_version(window, self.columns)
+
+        manifest = self._read_manifest()
+        stale = manifest is not None and manifest.get('version') != version
+        self.manifest = {
+            'version': version,
+            'window': window,
+            'columns': self.columns,
+            'segments': [] if manifest is None or stale else manifest['segments'],
+            'next_segment': 0 if manifest is None else manifest['next_segment'],
+        }
+        if manifest is None:
+            self._write_manifest(self.manifest)
+
+        segments = tuple(_Segment(self.root / name, self.columns) for name in self.manifest['segments'])
+        self._view = (segments, None)
+        self._last_cycle: Dict[int, int] = {}
+        for segment in segments:
+            for unit, cycle in segment.last_cycles().items():
+                self._last_cycle[unit] = max(cycle, self._last_cycle.get(unit, cycle))
+
+        # Rows re-engineered because the stored features were out of date
+        self.rebuilt = self._rebuild(manifest) if stale else 0
+
+    def _rebuild(self, old_manifest: Dict) -> int:
+        """Re-engineer every stored reading with the current code and window"""
+        old_segments = [_Segment(self.root / name, old_manifest['columns'])
+                        for name in old_manifest['segments']]
+        raw = [pd.DataFrame({col: np.asarray(seg.columns[col]) for col in RAW_COLS})
+               for seg in old_segments]
+        logger.info(f"Rebuilding feature store at {self.root}: stored features are out of date")
+
+        # The new manifest replaces the old one only once the new segment is written
+        if raw:
+            self.append(pd.concat(raw, ignore_index=True))
+        self.flush()
+        if not raw:
+            self._write_manifest(self.manifest)
+        for seg in old_segments:
+            shutil.rmtree(seg.path, ignore_errors=True)
+        return sum(len(df) for df in raw)
+
+    def __len__(self) -> int:
+        segments, pending = self._view
+        n_pending = 0 if pending is None else len(pending['unit_id'])
+        return sum(len(segment.columns['unit_id']) for segment in segments) + n_pending
+
+    @property
+    def unit_ids(self) -> List[int]:
+        """All units with stored cycles"""
+        return sorted(self._last_cycle)
+
+    def last_cycle(self, unit_id: int) -> Optional[int]:
+        """Latest stored cycle of a unit, or None"""
+        return self._last_cycle.get(unit_id)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _columns(self, columns: Optional[List[str]]) -> List[str]:
+        return INDEX_COLS + [c for c in (columns or self.columns) if c not in INDEX_COLS]
+
+    def read(self, unit_ids: Optional[Iterable[int]] = None, start_cycle: Optional[int] = None,
+             end_cycle: Optional[int] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Rows of the given units (default: all) within a cycle range, sorted by unit/cycle"""
+        columns = self._columns(columns)
+        segments, pending = self._view
+        if unit_ids is None and start_cycle is None and end_cycle is None:
+            parts = [{col: np.asarray(seg.columns[col]) for col in columns} for seg in segments]
+            if pending is not None:
+                parts.append(pending)
+            return self._frame(parts, columns)
+
+        ranges = None
+        if unit_ids is not None:
+            units = np.unique(np.fromiter(unit_ids, dtype=np.int64))
+            lo, hi = _bounds(start_cycle, end_cycle)
+            ranges = (units, np.full(len(units), lo), np.full(len(units), hi))
+        return self._read_ranges(ranges, columns, start_cycle, end_cycle)
+
+    def _read_ranges(self, ranges: Optional[CycleRanges], columns: List[str],
+                     start_cycle: Optional[int] = None, end_cycle: Optional[int] = None) -> pd.DataFrame:
+        """Rows of each unit within its own (start_cycle, end_cycle) range"""
+        return self._frame(self._range_parts(ranges, columns, start_cycle, end_cycle), columns)
+
+    def _range_parts(self, ranges: Optional[CycleRanges], columns: List[str],
+                     start_cycle: Optional[int] = None,
+                     end_cycle: Optional[int] = None) -> List[Dict[str, np.ndarray]]:
+        """Column arrays of the rows in range, per segment and from the buffer"""
+        segments, pending = self._view
+        parts = []
+        for seg in segments:
+            if ranges is None:
+                lo, hi = _bounds(start_cycle, end_cycle)
+                units = seg.units
+                lo, hi = np.full(len(units), lo), np.full(len(units), hi)
+            else:
+                units, lo, hi = ranges
+            rows = _concat_ranges(*seg.row_ranges(units, lo, hi))
+            parts.append({col: seg.columns[col][rows] for col in columns})
+
+        if pending is not None:
+            mask = _range_mask(pending['unit_id'], pending['time_cycles'], ranges, start_cycle, end_cycle)
+            parts.append({col: pending[col][mask] for col in columns})
+        return parts
+
+    @staticmethod
+    def _frame(parts: List[Dict[str, np.ndarray]], columns: List[str]) -> pd.DataFrame:
+        """Concatenate column arrays of segments and the buffer, sorted by unit/cycle"""
+        if not parts:
+            return FeatureStore._empty(columns)
+        data = {col: np.concatenate([np.asarray(part[col]) for part in parts]) for col in columns}
+        order = np.lexsort((data['time_cycles'], data['unit_id']))
+        return pd.DataFrame({col: values[order] for col, values in data.items()})
+
+    def latest(self, unit_ids: Optional[Iterable[int]] = None,
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """The most recent stored cycle of each unit, sorted by unit"""
+        columns = self._columns(columns)
+        segments, pending = self._view
+        wanted = None if unit_ids is None else np.asarray(list(unit_ids), dtype=np.int64)
+
+        # A unit's latest cycle is the last row of that unit in a segment or the buffer
+        parts = []
+        for seg in segments:
+            rows = seg.offsets[1:] - 1
+            if wanted is not None:
+                rows = rows[np.isin(seg.units, wanted)]
+            parts.append({col: seg.columns[col][rows] for col in columns})
+        if pending is not None:
+            # Buffered cycles of a unit arrive in increasing order
+            units = pending['unit_id']
+            unique, from_end = np.unique(units[::-1], return_index=True)
+            rows = len(units) - 1 - from_end
+            if wanted is not None:
+                rows = rows[np.isin(unique, wanted)]
+            parts.append({col: pending[col][rows] for col in columns})
+
+        df = self._frame(parts, columns)
+        return df.drop_duplicates('unit_id', keep='last').reset_index(drop=True)
+
+    def with_history(self, readings: pd.DataFrame, lookback: int) -> pd.DataFrame:
+        """Raw readings preceded by up to ``lookback`` stored cycles of their unit.
+
+        Stored cycles that the readings resend are replaced by the readings.
+        Rows are sorted by unit/cycle; ``_row`` is each reading's position in
+        ``readings`` and -1 for stored history. Nothing is written.
+        """
+        columns = RAW_COLS + ['_row']
+        request = {col: readings[col].to_numpy(dtype=_dtype(col)) for col in RAW_COLS}
+        request['_row'] = np.arange(len(readings))
+        parts = [request]
+        if lookback > 0 and len(readings):
+            units, inverse = np.unique(request['unit_id'], return_inverse=True)
+            lo = np.full(len(units), np.iinfo(np.int64).max)
+            hi = np.full(len(units), np.iinfo(np.int64).min)
+            np.minimum.at(lo, inverse, request['time_cycles'])
+            np.maximum.at(hi, inverse, request['time_cycles'])
+            ranges = (units, lo - lookback, hi)
+
+            resent = _row_keys(request)
+            for part in self._range_parts(ranges, RAW_COLS):
+                keep = ~np.isin(_row_keys(part), resent)
+                stored = {col: part[col][keep] for col in RAW_COLS}
+                stored['_row'] = np.full(int(keep.sum()), -1)
+                parts.append(stored)
+        return self._frame(parts, columns)
+
+    def lookup(self, keys: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Stored rows for the unit_id/time_cycles pairs in keys, in keys' order"""
+        stored = self.read(keys['unit_id'].unique(), int(keys['time_cycles'].min()),
+                           int(keys['time_cycles'].max()), columns)
+        stored = stored.astype({'unit_id': keys['unit_id'].dtype,
+                                'time_cycles': keys['time_cycles'].dtype})
+        return keys[INDEX_COLS].merge(stored, on=INDEX_COLS, how='left')
+
+    @staticmethod
+    def _empty(columns: List[str]) -> pd.DataFrame:
+        return pd.DataFrame({col: np.empty(0, dtype=_dtype(col)) for col in columns})
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, readings: pd.DataFrame) -> int:
+        """Engineer and store cycles newer than what is stored; returns rows added"""
+        with self._lock:
+            # Last copy of each unit/cycle, in unit/cycle order, newer than what is stored
+            keys = _row_keys(readings)
+            _, from_end = np.unique(keys[::-1], return_index=True)
+            rows = len(keys) - 1 - from_end
+            units = readings['unit_id'].to_numpy(dtype=np.int64)[rows]
+            cycles = readings['time_cycles'].to_numpy(dtype=np.int64)[rows]
+            last = np.fromiter((self._last_cycle.get(u, -1) for u in units.tolist()),
+                               dtype=np.int64, count=len(units))
+            newer = cycles > last
+            if not newer.any():
+                return 0
+            new = readings[RAW_COLS].iloc[rows[newer]]
+            units, cycles = units[newer], cycles[newer]
+
+            if self.sensors:
+                # Stored cycles needed to continue each unit's rolling windows
+                known = [u for u in new['unit_id'].unique() if u in self._last_cycle]
+                start = min((self._last_cycle[u] for u in known), default=0) - self.window + 2
+                history = self.read(known, start_cycle=start, columns=RAW_COLS)
+                history = history[history['time_cycles'] >
+                                  history['unit_id'].map(self._last_cycle) - self.window + 1]
+                combined = pd.concat([history.assign(_new=False), new.assign(_new=True)],
+                                     ignore_index=True)
+                combined = combined.sort_values(INDEX_COLS, kind='stable').reset_index(drop=True)
+
+                engineered = add_rolling_features(combined, self.sensors, window=self.window)
+                new = engineered[engineered.pop('_new')]
+
+            self._buffer_rows(new)
+            ends = np.append(units[1:] != units[:-1], True)
+            self._last_cycle.update(zip(units[ends].tolist(), cycles[ends].tolist()))
+
+            if self._buffered >= self.flush_rows:
+                self._flush()
+            return len(new)
+
+    def sync(self, readings: pd.DataFrame) -> int:
+        """Make the store hold exactly these readings; returns rows engineered.
+
+        Readings that only add cycles past each unit's stored ones are
+        appended incrementally. If a stored reading changed or is missing,
+        or an earlier cycle was inserted, the store is rebuilt from them.
+        """
+        keys = _row_keys(readings)
+        unique_keys, from_end = np.unique(keys[::-1], return_index=True)
+        readings = readings[RAW_COLS].iloc[len(keys) - 1 - from_end]
+        self.flush()
+        stored = self.read(columns=RAW_COLS)
+
+        stored_keys = _row_keys(stored)
+        pos = np.searchsorted(unique_keys, stored_keys)
+        matches = (pos < len(unique_keys)).all() and (unique_keys[pos] == stored_keys).all()
+        if matches:
+            matches = np.array_equal(stored.to_numpy(dtype=np.float64),
+                                     readings.iloc[pos].to_numpy(dtype=np.float64), equal_nan=True)
+        if matches:
+            added = np.ones(len(readings), dtype=bool)
+            added[pos] = False
+            units = readings['unit_id'].to_numpy(dtype=np.int64)[added]
+            last = np.fromiter((self._last_cycle.get(u, -1) for u in units.tolist()),
+                               dtype=np.int64, count=len(units))
+            matches = (readings['time_cycles'].to_numpy(dtype=np.int64)[added] > last).all()
+
+        if len(stored) and not matches:
+            logger.info(f"Rebuilding feature store at {self.root}: stored readings changed")
+            with self._lock:
+                self._clear()
+        return self.append(readings)
+
+    def _clear(self):
+        """Drop every stored row (callers hold the lock)"""
+        segments, _ = self._view
+        self._buffer, self._buffered = None, 0
+        self._last_cycle = {}
+        self._publish((), None)
+        for segment in segments:
+            shutil.rmtree(segment.path, ignore_errors=True)
+
+    def _buffer_rows(self, df: pd.DataFrame):
+        """Copy rows into the buffer past the rows that readers may already see"""
+        start, end = self._buffered, self._buffered + len(df)
+        if self._buffer is None or end > len(self._buffer['unit_id']):
+            capacity = max(self.flush_rows, 2 * end)
+            grown = {col: np.empty(capacity, dtype=_dtype(col)) for col in self.columns}
+            if self._buffer is not None:
+                for col in self.columns:
+                    grown[col][:start] = self._buffer[col][:start]
+            self._buffer = grown
+
+        values = df[self.columns].to_numpy(dtype=np.float64)
+        for i, col in enumerate(self.columns):
+            self._buffer[col][start:end] = values[:, i]
+        self._buffered = end
+        self._view = (self._view[0], {col: values[:end] for col, values in self._buffer.items()})
+
+    def flush(self):
+        """Write buffered rows to a new segment and wait for a running merge"""
+        with self._lock:
+            self._flush()
+            compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def compact(self):
+        """Flush and merge all segments into one"""
+        self.flush()
+        with self._lock:
+            compactor = self._start_compaction()
+        compactor.join()
+
+    def _flush(self):
+        segments, pending = self._view
+        if pending is None:
+            return
+        segment = self._write_segment(self._frame([pending], self.columns), self._segment_name())
+
+        # Later appends start a new buffer; snapshots of this one stay valid
+        self._buffer, self._buffered = None, 0
+        self._publish(segments + (segment,), None)
+        if len(segments) + 1 > MAX_SEGMENTS:
+            self._start_compaction()
+
+    def _start_compaction(self) -> threading.Thread:
+        """Merge the current segments on a background thread (one merge at a time)"""
+        if self._compactor is None or not self._compactor.is_alive():
+            self._compactor = threading.Thread(
+                target=self._merge_segments, args=(self._view[0], self._segment_name()),
+                name='feature-store-compaction', daemon=True
+            )
+            self._compactor.start()
+        return self._compactor
+
+    def _merge_segments(self, segments: Tuple[_Segment, ...], name: str):
+        """Write segments as one merged segment, then swap it in for them"""
+        if len(segments) <= 1:
+            return
+        try:
+            merged = self._write_segment(
+                self._frame([seg.columns for seg in segments], self.columns), name)
+        except Exception as e:
+            logger.error(f"Merging feature store segments failed: {e}")
+            return
+
+        # Segments flushed during the merge follow the merged one
+        with self._lock:
+            current, pending = self._view
+            self._publish((merged,) + current[len(segments):], pending)
+        for segment in segments:
+            shutil.rmtree(segment.path, ignore_errors=True)
+
+    def _segment_name(self) -> str:
+        name = f"segment-{self.manifest['next_segment']:06d}"
+        self.manifest['next_segment'] += 1
+        return name
+
+    def _write_segment(self, df: pd.DataFrame, name: str) -> _Segment:
+        """Write a segment of rows sorted by unit/cycle to disk atomically"""
+        tmp_dir = self.root / f'.{name}.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir()
+
+        for col in self.columns:
+            np.save(tmp_dir / f'{col}.npy', df[col].to_numpy(dtype=_dtype(col)))
+
+        unit_ids = df['unit_id'].to_numpy(dtype=np.int64)
+        units, starts = np.unique(unit_ids, return_index=True)
+        np.save(tmp_dir / 'units.npy', units)
+        np.save(tmp_dir / 'offsets.npy', np.append(starts, len(unit_ids)))
+        os.replace(tmp_dir, self.root / name)
+        return _Segment(self.root / name, self.columns)
+
+    def _publish(self, segments: Tuple[_Segment, ...], pending: Optional[Dict[str, np.ndarray]]):
+        """Record the segments in the manifest, then switch readers to them"""
+        self.manifest['segments'] = [seg.path.name for seg in segments]
+        self._write_manifest(self.manifest)
+        self._view = (segments, pending)
+
+    def _read_manifest(self) -> Optional[Dict]:
+        path = self.root / MANIFEST_FILE
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def _write_manifest(self, manifest: Dict):
+        tmp = self.root / f'.{MANIFEST_FILE}.tmp'
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, self.root / MANIFEST_FILE)
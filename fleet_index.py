@@ -0,0 +1,349 @@
+"""
+Fleet Index of Latest Predictions for Turbofan Engine RUL Prediction
+
+Keeps the most recent predicted RUL of every engine in compact numpy arrays
+sorted by RUL, so fleet-level questions ("the 50 engines with the lowest
+RUL", "every engine under 30 cycles") are a binary search plus a slice:
+O(log n + k) for k results.
+
+Each entry's sort key is one uint64: the bit pattern of its float32 RUL in
+the high half and the unit id in the low half. RUL is non-negative, so the
+bit patterns sort like the values, and ties are ordered by unit id. A unit
+therefore has exactly one key, and replacing its entry means finding that
+key by binary search.
+
+New predictions go to a small pending buffer that queries consult next to
+the sorted arrays. Once it fills up, the buffer is merged in
+O(n + m log n) without re-sorting the index. Memory is 38 bytes per
+engine, so millions of engines per instance fit comfortably. Snapshots are
+single .npz files that hold both sort orders, so a restart loads them
+without sorting.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Pending updates merged into the sorted arrays at once
+MERGE_ROWS = 4096
+
+MAX_UNIT_ID = 2 ** 32 - 1
+_UNIT_MASK = np.uint64(MAX_UNIT_ID)
+
+
+def _sort_keys(rul: np.ndarray, units: np.ndarray) -> np.ndarray:
+    """(RUL bits << 32) | unit_id; sorts by RUL, then unit id"""
+    # Adding +0.0 turns -0.0 into +0.0, whose bits sort before every positive value
+    rul = np.asarray(rul, dtype=np.float32) + np.float32(0)
+    bits = rul.view(np.uint32).astype(np.uint64)
+    return (bits << np.uint64(32)) | np.asarray(units, dtype=np.uint64)
+
+
+def _key_rul(keys: np.ndarray) -> np.ndarray:
+    return (keys >> np.uint64(32)).astype(np.uint32).view(np.float32)
+
+
+def _key_units(keys: np.ndarray) -> np.ndarray:
+    return (keys & _UNIT_MASK).astype(np.int64)
+
+
+class FleetIndex:
+    """Latest predicted RUL per engine, sorted for ranking and range queries"""
+
+    def __init__(self, merge_rows: int = MERGE_ROWS):
+        self.merge_rows = merge_rows
+        self._lock = threading.Lock()
+
+        # RUL order: sort key, cycle and model version code of every entry
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._cycles = np.empty(0, dtype=np.int64)
+        self._codes = np.empty(0, dtype=np.int16)
+
+        # Unit order: unit id, its current sort key and cycle
+        self._units = np.empty(0, dtype=np.uint32)
+        self._unit_keys = np.empty(0, dtype=np.uint64)
+        self._unit_cycles = np.empty(0, dtype=np.int64)
+
+        # unit_id -> (cycle, sort key, version code) not merged yet
+        self._pending: Dict[int, Tuple[int, int, int]] = {}
+        self._pending_view = None
+
+        self.versions: List[str] = []
+        self._version_codes: Dict[str, int] = {}
+
+        self._snapshotter: Optional[threading.Thread] = None
+        self._stop_snapshots = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, unit_ids, time_cycles, predicted_rul, model_versions: List[str]) -> int:
+        """Record predictions; a unit's entry is only replaced by a cycle at least as recent.
+
+        Returns the number of units whose entry changed.
+        """
+        units = np.asarray(unit_ids, dtype=np.int64)
+        cycles = np.asarray(time_cycles, dtype=np.int64)
+        rul = np.asarray(predicted_rul, dtype=np.float32)
+        if ((units < 0) | (units > MAX_UNIT_ID)).any():
+            raise ValueError(f"unit_id must be between 0 and {MAX_UNIT_ID}")
+
+        valid = np.isfinite(rul)
+        if not valid.all():
+            units, cycles, rul = units[valid], cycles[valid], rul[valid]
+            model_versions = [v for v, ok in zip(model_versions, valid) if ok]
+        if len(units) == 0:
+            return 0
+
+        # Latest cycle per unit within the batch (later rows win ties)
+        order = np.lexsort((np.arange(len(units)), cycles, units))
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = units[order][1:] != units[order][:-1]
+        rows = order[last]
+
+        with self._lock:
+            codes = np.array([self._version_code(model_versions[i]) for i in rows], dtype=np.int16)
+            units, cycles, rul = units[rows], cycles[rows], np.maximum(rul[rows], 0)
+            keys = _sort_keys(rul, units)
+
+            if len(rows) >= self.merge_rows:
+                self._merge()
+                accept = cycles >= self._stored_cycles(units)
+                self._merge_entries(units[accept], cycles[accept], keys[accept], codes[accept])
+                return int(accept.sum())
+
+            current = self._stored_cycles(units)
+            changed = 0
+            for unit, cycle, key, code, stored in zip(units.tolist(), cycles.tolist(), keys.tolist(),
+                                                      codes.tolist(), current.tolist()):
+                pending = self._pending.get(unit)
+                if cycle >= (pending[0] if pending is not None else stored):
+                    self._pending[unit] = (cycle, key, code)
+                    changed += 1
+            if changed:
+                self._pending_view = None
+            if len(self._pending) >= self.merge_rows:
+                self._merge()
+            return changed
+
+    def _version_code(self, version: Optional[str]) -> int:
+        version = version or ''
+        code = self._version_codes.get(version)
+        if code is None:
+            code = self._version_codes[version] = len(self.versions)
+            self.versions.append(version)
+        return code
+
+    def _stored_cycles(self, units: np.ndarray) -> np.ndarray:
+        """Cycle of each unit's merged entry (-1 if it has none)"""
+        stored = np.full(len(units), -1, dtype=np.int64)
+        # Matching dtypes keep searchsorted from casting the whole index
+        units = units.astype(np.uint32)
+        idx = np.searchsorted(self._units, units)
+        found = idx < len(self._units)
+        found[found] = self._units[idx[found]] == units[found]
+        stored[found] = self._unit_cycles[idx[found]]
+        return stored
+
+    def _merge(self):
+        """Fold the pending buffer into the sorted arrays"""
+        if not self._pending:
+            return
+        units = np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending))
+        entries = np.array(list(self._pending.values()), dtype=np.uint64).reshape(-1, 3)
+        self._merge_entries(units, entries[:, 0].astype(np.int64), entries[:, 1],
+                            entries[:, 2].astype(np.int16))
+        self._pending = {}
+        self._pending_view = None
+
+    def _merge_entries(self, units, cycles, keys, codes):
+        """Replace/insert entries of distinct units, in O(n + m log n)"""
+        if len(units) == 0:
+            return
+        units = units.astype(np.uint32)
+        idx = np.searchsorted(self._units, units)
+        exists = idx < len(self._units)
+        exists[exists] = self._units[idx[exists]] == units[exists]
+
+        # Drop the replaced entries from the RUL order
+        if exists.any():
+            drop = np.searchsorted(self._keys, self._unit_keys[idx[exists]])
+            keep = np.ones(len(self._keys), dtype=bool)
+            keep[drop] = False
+            self._keys, self._cycles, self._codes = (
+                self._keys[keep], self._cycles[keep], self._codes[keep])
+
+        # Insert the new entries at their sorted positions
+        order = np.argsort(keys, kind='stable')
+        at = np.searchsorted(self._keys, keys[order])
+        self._keys = np.insert(self._keys, at, keys[order])
+        self._cycles = np.insert(self._cycles, at, cycles[order])
+        self._codes = np.insert(self._codes, at, codes[order])
+
+        # Unit order: update known units, insert new ones
+        self._unit_keys[idx[exists]] = keys[exists]
+        self._unit_cycles[idx[exists]] = cycles[exists]
+        new = ~exists
+        if new.any():
+            order = np.argsort(units[new], kind='stable')
+            at = idx[new][order]
+            self._units = np.insert(self._units, at, units[new][order])
+            self._unit_keys = np.insert(self._unit_keys, at, keys[new][order])
+            self._unit_cycles = np.insert(self._unit_cycles, at, cycles[new][order])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _pending_arrays(self):
+        """Pending entries sorted by key, plus the keys they replace"""
+        if self._pending_view is None:
+            units = np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending))
+            entries = np.array(list(self._pending.values()), dtype=np.uint64).reshape(-1, 3)
+            order = np.argsort(entries[:, 1], kind='stable')
+            units, entries = units[order].astype(np.uint32), entries[order]
+
+            idx = np.searchsorted(self._units, units)
+            exists = idx < len(self._units)
+            exists[exists] = self._units[idx[exists]] == units[exists]
+            self._pending_view = {
+                'keys': entries[:, 1],
+                'cycles': entries[:, 0].astype(np.int64),
+                'codes': entries[:, 2].astype(np.int16),
+                'units_sorted': np.sort(units),
+                'replaced': np.sort(self._unit_keys[idx[exists]]),
+                'n_new': int((~exists).sum()),
+            }
+        return self._pending_view
+
+    def _select(self, lo: int, hi: Optional[int], limit: Optional[int]):
+        """Entries with lo <= key < hi in RUL order, and the total number of matches"""
+        with self._lock:
+            pend = self._pending_arrays()
+            a = int(np.searchsorted(self._keys, np.uint64(lo)))
+            b = len(self._keys) if hi is None else int(np.searchsorted(self._keys, np.uint64(hi)))
+
+            # Entries superseded by a pending update lie in the slice at most len(pending) times
+            end = b if limit is None else min(b, a + limit + len(pend['replaced']))
+            keys, cycles, codes = self._keys[a:end], self._cycles[a:end], self._codes[a:end]
+            units_sorted = pend['units_sorted']
+            if len(units_sorted):
+                slice_units = (keys & _UNIT_MASK).astype(np.uint32)
+                pos = np.searchsorted(units_sorted, slice_units)
+                stale = units_sorted[np.minimum(pos, len(units_sorted) - 1)] == slice_units
+                keys, cycles, codes = keys[~stale], cycles[~stale], codes[~stale]
+
+            p_lo = int(np.searchsorted(pend['keys'], np.uint64(lo)))
+            p_hi = len(pend['keys']) if hi is None else int(np.searchsorted(pend['keys'], np.uint64(hi)))
+            replaced = pend['replaced']
+            r_lo = int(np.searchsorted(replaced, np.uint64(lo)))
+            r_hi = len(replaced) if hi is None else int(np.searchsorted(replaced, np.uint64(hi)))
+            total = (b - a) - (r_hi - r_lo) + (p_hi - p_lo)
+
+            if p_hi > p_lo:
+                keys = np.concatenate([keys, pend['keys'][p_lo:p_hi]])
+                cycles = np.concatenate([cycles, pend['cycles'][p_lo:p_hi]])
+                codes = np.concatenate([codes, pend['codes'][p_lo:p_hi]])
+                order = np.argsort(keys, kind='stable')
+                keys, cycles, codes = keys[order], cycles[order], codes[order]
+            if limit is not None:
+                keys, cycles, codes = keys[:limit], cycles[:limit], codes[:limit]
+            versions = np.array(self.versions, dtype=object)
+
+        return pd.DataFrame({
+            'unit_id': _key_units(keys),
+            'time_cycles': cycles,
+            'predicted_rul': _key_rul(keys).astype(np.float64),
+            'model_version': versions[codes] if len(codes) else np.empty(0, dtype=object),
+        }), total
+
+    def lowest(self, k: int) -> Tuple[pd.DataFrame, int]:
+        """The k engines with the lowest predicted RUL"""
+        return self._select(0, None, k)
+
+    def below(self, threshold: float, limit: Optional[int] = None) -> Tuple[pd.DataFrame, int]:
+        """Engines with predicted RUL < threshold, lowest first"""
+        if threshold <= 0:
+            return self._select(0, 0, limit)
+        return self._select(0, int(_sort_keys([threshold], [0])[0]), limit)
+
+    def between(self, min_rul: float, max_rul: float,
+                limit: Optional[int] = None) -> Tuple[pd.DataFrame, int]:
+        """Engines with min_rul <= predicted RUL <= max_rul, lowest first"""
+        lo = int(_sort_keys([max(min_rul, 0)], [0])[0])
+        if max_rul < max(min_rul, 0):
+            return self._select(lo, lo, limit)
+        hi = int(_sort_keys([max_rul], [MAX_UNIT_ID])[0]) + 1
+        return self._select(lo, None if hi > np.iinfo(np.uint64).max else hi, limit)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._units) + self._pending_arrays()['n_new']
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path):
+        """Write the index to an .npz file (atomically)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._merge()
+            arrays = {
+                'keys': self._keys, 'cycles': self._cycles, 'codes': self._codes,
+                # Unit-order keys and cycles are updated in place, so copy them
+                'units': self._units, 'unit_keys': self._unit_keys.copy(),
+                'unit_cycles': self._unit_cycles.copy(),
+                'versions': np.array(self.versions, dtype=str),
+            }
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, merge_rows: int = MERGE_ROWS) -> 'FleetIndex':
+        """Index from a snapshot written by save()"""
+        index = cls(merge_rows=merge_rows)
+        with np.load(path, allow_pickle=False) as snapshot:
+            index._keys = snapshot['keys'].astype(np.uint64, copy=False)
+            index._cycles = snapshot['cycles'].astype(np.int64, copy=False)
+            index._codes = snapshot['codes'].astype(np.int16, copy=False)
+            index._units = snapshot['units'].astype(np.uint32, copy=False)
+            index._unit_keys = snapshot['unit_keys'].astype(np.uint64, copy=False)
+            index._unit_cycles = snapshot['unit_cycles'].astype(np.int64, copy=False)
+            index.versions = snapshot['versions'].tolist()
+        index._version_codes = {v: i for i, v in enumerate(index.versions)}
+        return index
+
+    def start_snapshots(self, path: Path, interval: float):
+        """Save a snapshot every interval seconds in the background"""
+        if self._snapshotter is not None:
+            return
+        self._stop_snapshots.clear()
+        self._snapshotter = threading.Thread(
+            target=self._snapshot_loop, args=(Path(path), interval), name='fleet-snapshots', daemon=True
+        )
+        self._snapshotter.start()
+        logger.info(f"Snapshotting fleet index to {path} every {interval:.0f}s")
+
+    def stop_snapshots(self):
+        """Stop periodic snapshots"""
+        self._stop_snapshots.set()
+        self._snapshotter = None
+
+    def _snapshot_loop(self, path: Path, interval: float):
+        while not self._stop_snapshots.wait(interval):
+            try:
+                self.save(path)
+            except Exception as e:
+                logger.error(f"Fleet index snapshot to {path} failed: {e}")
@@ -0,0 +1,306 @@
+"""
+Versioned Model Registry for Turbofan Engine RUL Prediction
+
+Trained model bundles are stored in versioned directories under
+models/registry/. The prediction service keeps the loaded bundles in a
+single immutable routing table that is swapped atomically, so a new
+version can be loaded in the background and rolled out (or canaried on
+a share of the traffic) without restarting the service.
+"""
+
+import os
+import pickle
+import shutil
+import threading
+import zlib
+import logging
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default locations
+MODEL_DIR = Path('models')
+REGISTRY_DIR = MODEL_DIR / 'registry'
+
+# Pointer file holding the version the service should serve
+ACTIVE_FILE = 'ACTIVE'
+
+# Version name used for the flat artifacts in MODEL_DIR (pre-registry layout)
+BASELINE_VERSION = 'baseline'
+
+# Artifact files that make up one model bundle
+ARTIFACT_FILES = {
+    'model': 'xgboost_rul_model.pkl',
+    'scaler': 'scaler.pkl',
+    'config': 'config.pkl',
+    'metadata': 'model_metadata.pkl',
+}
+
+# ============================================================================
+# MODEL STATE
+# ============================================================================
+
+@dataclass(frozen=True)
+class ModelState:
+    """Everything needed to serve one model version"""
+    version: str
+    model: Any
+    scaler: Any
+    config: Dict
+    metadata: Dict
+
+
+@dataclass(frozen=True)
+class RoutingTable:
+    """Primary model plus an optional candidate receiving a share of traffic"""
+    primary: ModelState
+    candidate: Optional[ModelState] = None
+    candidate_percent: float = 0.0
+
+    def select(self, unit_id: int) -> ModelState:
+        """Pick the model serving this engine (sticky per unit_id)"""
+        if self.candidate is None or self.candidate_percent <= 0:
+            return self.primary
+        bucket = zlib.crc32(str(unit_id).encode()) % 10000
+        if bucket < self.candidate_percent * 100:
+            return self.candidate
+        return self.primary
+
+
+def load_bundle(bundle_dir: Path, version: str) -> ModelState:
+    """Load the artifacts of one bundle directory into a ModelState"""
+    artifacts = {}
+    for name, filename in ARTIFACT_FILES.items():
+        with open(bundle_dir / filename, 'rb') as f:
+            artifacts[name] = pickle.load(f)
+    return ModelState(version=version, **artifacts)
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+class ModelRegistry:
+    """Local-directory registry of versioned model bundles"""
+
+    def __init__(self, root: Path = REGISTRY_DIR, fallback_dir: Path = MODEL_DIR):
+        self.root = Path(root)
+        self.fallback_dir = Path(fallback_dir)
+
+    def list_versions(self) -> List[str]:
+        """Return all complete bundle versions, oldest first"""
+        if not self.root.exists():
+            return []
+        return sorted(
+            p.name for p in self.root.iterdir()
+            if p.is_dir() and not p.name.startswith('.')
+            and all((p / f).exists() for f in ARTIFACT_FILES.values())
+        )
+
+    def has_version(self, version: str) -> bool:
+        """Whether a version names a registry bundle or the baseline artifacts"""
+        return version == BASELINE_VERSION or version in self.list_versions()
+
+    def version_dir(self, version: str) -> Path:
+        """Directory holding the artifacts of a version"""
+        # Versions come from API requests; only names the registry lists map to paths
+        if not self.has_version(version):
+            raise ValueError(f"Unknown model version: {version}")
+        if version == BASELINE_VERSION:
+            return self.fallback_dir
+        return self.root / version
+
+    def active_version(self) -> str:
+        """Version named by the ACTIVE pointer, or the baseline artifacts"""
+        pointer = self.root / ACTIVE_FILE
+        if pointer.exists():
+            version = pointer.read_text().strip()
+            if version:
+                return version
+        return BASELINE_VERSION
+
+    def set_active(self, version: str):
+        """Atomically point ACTIVE at a version"""
+        if not self.has_version(version):
+            raise ValueError(f"Unknown model version: {version}")
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f'.{ACTIVE_FILE}.tmp'
+        tmp.write_text(version)
+        os.replace(tmp, self.root / ACTIVE_FILE)
+
+    def new_version(self) -> str:
+        """Timestamp version name, suffixed if one was already published this second"""
+        base = pd.Timestamp.now().strftime('v%Y%m%d-%H%M%S')
+        version, n = base, 1
+        while (self.root / version).exists():
+            n += 1
+            version = f'{base}-{n}'
+        return version
+
+    def publish(self, artifacts: Dict[str, Any], version: Optional[str] = None) -> str:
+        """Write a new bundle; it only becomes visible once fully written"""
+        missing = set(ARTIFACT_FILES) - set(artifacts)
+        if missing:
+            raise ValueError(f"Missing artifacts for bundle: {sorted(missing)}")
+
+        version = version or self.new_version()
+        target = self.root / version
+        if target.exists():
+            raise ValueError(f"Model version already exists: {version}")
+
+        tmp_dir = self.root / f'.{version}.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for name, filename in ARTIFACT_FILES.items():
+            with open(tmp_dir / filename, 'wb') as f:
+                pickle.dump(artifacts[name], f)
+        os.replace(tmp_dir, target)
+        return version
+
+    def load(self, version: Optional[str] = None) -> ModelState:
+        """Load a version (defaults to the active one)"""
+        version = version or self.active_version()
+        bundle_dir = self.version_dir(version)
+        if not bundle_dir.exists():
+            raise ValueError(f"Unknown model version: {version}")
+        return load_bundle(bundle_dir, version)
+
+# ============================================================================
+# MODEL SERVER
+# ============================================================================
+
+class ModelServer:
+    """Holds the routing table and swaps it atomically on reloads.
+
+    Readers call ``routing()`` once per request and keep using that table,
+    so in-flight requests finish on the version they started with.
+    """
+
+    def __init__(self, registry: ModelRegistry):
+        self.registry = registry
+        self._routing: Optional[RoutingTable] = None
+        self._write_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self.load_status: Dict[str, str] = {}
+
+    def routing(self) -> Optional[RoutingTable]:
+        """Current routing table (None until a model is loaded)"""
+        return self._routing
+
+    def _swap(self, update: Callable[[Optional[RoutingTable]], RoutingTable]):
+        with self._write_lock:
+            self._routing = update(self._routing)
+
+    def load_primary(self, version: Optional[str] = None, persist: bool = False) -> ModelState:
+        """Load a version and make it the primary model.
+
+        With persist, ACTIVE is pointed at the version too, so the watcher
+        and restarts keep serving it.
+        """
+        state = self._load(version)
+        if persist:
+            self.registry.set_active(state.version)
+
+        def update(current):
+            if current is None:
+                return RoutingTable(primary=state)
+            if current.candidate is not None and current.candidate.version == state.version:
+                return RoutingTable(primary=state)
+            return replace(current, primary=state)
+
+        self._swap(update)
+        logger.info(f"✓ Serving model version {state.version}")
+        return state
+
+    def load_candidate(self, version: str, percent: float) -> ModelState:
+        """Load a version and route a percentage of engines to it"""
+        if self._routing is None:
+            raise RuntimeError("No primary model loaded")
+        state = self._load(version)
+        self._swap(lambda current: replace(
+            current, candidate=state, candidate_percent=percent
+        ))
+        logger.info(f"✓ Candidate model {state.version} receiving {percent:.1f}% of traffic")
+        return state
+
+    def set_traffic(self, percent: float):
+        """Change the share of traffic routed to the candidate"""
+        def update(current):
+            if current is None or current.candidate is None:
+                raise RuntimeError("No candidate model loaded")
+            return replace(current, candidate_percent=percent)
+
+        self._swap(update)
+
+    def promote_candidate(self) -> ModelState:
+        """Make the candidate the primary model and persist the choice"""
+        promoted = []
+
+        # Checked and replaced under the write lock, so a concurrent swap
+        # cannot change the candidate in between
+        def update(current):
+            if current is None or current.candidate is None:
+                raise RuntimeError("No candidate model loaded")
+            self.registry.set_active(current.candidate.version)
+            promoted.append(current.candidate)
+            return RoutingTable(primary=current.candidate)
+
+        self._swap(update)
+        logger.info(f"✓ Promoted model version {promoted[0].version}")
+        return promoted[0]
+
+    def clear_candidate(self):
+        """Stop routing traffic to the candidate"""
+        self._swap(lambda current: replace(current, candidate=None, candidate_percent=0.0))
+
+    def _load(self, version: Optional[str]) -> ModelState:
+        version = version or self.registry.active_version()
+        self.load_status[version] = 'loading'
+        try:
+            state = self.registry.load(version)
+        except Exception as e:
+            self.load_status[version] = f'failed: {e}'
+            raise
+        self.load_status[version] = 'loaded'
+        return state
+
+    # ------------------------------------------------------------------
+    # File watcher
+    # ------------------------------------------------------------------
+
+    def start_watching(self, interval: float):
+        """Poll the ACTIVE pointer and hot-load the version it names"""
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name='model-watcher', daemon=True
+        )
+        self._watcher.start()
+        logger.info(f"Watching {self.registry.root / ACTIVE_FILE} every {interval:.0f}s")
+
+    def stop_watching(self):
+        """Stop the ACTIVE pointer watcher"""
+        self._stop_watching.set()
+        self._watcher = None
+
+    def _watch(self, interval: float):
+        # Only a change of ACTIVE triggers a reload, so a primary loaded by
+        # other means is not replaced just because it differs from ACTIVE
+        seen = self.registry.active_version()
+        while not self._stop_watching.wait(interval):
+            version = self.registry.active_version()
+            if version == seen:
+                continue
+            current = self._routing
+            if current is None or current.primary.version != version:
+                try:
+                    self.load_primary(version)
+                except Exception as e:
+                    logger.error(f"Hot reload of model version {version} failed: {e}")
+                    continue
+            seen = version
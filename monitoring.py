@@ -0,0 +1,241 @@
+"""
+Drift and Input Monitoring for Turbofan Engine RUL Prediction
+
+At training time ``build_reference_profile`` captures the training
+distribution of every input feature and of the predicted RUL as decile
+histograms. At serving time ``DriftMonitor`` streams live readings into
+histograms with the same bin edges plus running moments, so memory is
+fixed (n_features x n_bins counters) regardless of traffic, and each batch
+update is a vectorized binning pass plus one bincount: O(1) work per value
+with no per-row Python. Reports compare live and
+reference histograms with PSI and a binned Kolmogorov-Smirnov statistic.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+N_BINS = 10
+
+# PSI thresholds commonly used for population stability
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+# Batches up to this size are binned with one broadcast comparison
+SMALL_BATCH = 256
+
+# Smoothing for empty bins in PSI
+EPSILON = 1e-4
+
+PREDICTION = 'predicted_rul'
+
+# ============================================================================
+# REFERENCE PROFILE
+# ============================================================================
+
+def _histogram_profile(values: np.ndarray, n_bins: int) -> Dict:
+    """Quantile bin edges and reference proportions of one variable"""
+    values = np.asarray(values, dtype=np.float64)
+    edges = np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])
+    counts = np.bincount(np.searchsorted(edges, values, side='right'), minlength=n_bins)
+    return {
+        'edges': edges.tolist(),
+        'proportions': (counts / counts.sum()).tolist(),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'mean': float(values.mean()),
+        'variance': float(values.var(ddof=1)) if len(values) > 1 else 0.0,
+    }
+
+
+def build_reference_profile(df: pd.DataFrame, feature_cols: List[str], predictions,
+                            low_variance_features: List[str], variance_threshold: float,
+                            n_bins: int = N_BINS) -> Dict:
+    """Reference distribution of the training inputs and predicted RUL"""
+    return {
+        'n_bins': n_bins,
+        'n_rows': len(df),
+        'features': list(feature_cols),
+        'low_variance_features': list(low_variance_features),
+        'variance_threshold': variance_threshold,
+        'histograms': {col: _histogram_profile(df[col].to_numpy(), n_bins) for col in feature_cols},
+        'prediction': _histogram_profile(predictions, n_bins),
+    }
+
+# ============================================================================
+# STREAMING MONITOR
+# ============================================================================
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """PSI per row of two (n_variables, n_bins) proportion arrays"""
+    expected = np.clip(expected, EPSILON, None)
+    actual = np.clip(actual, EPSILON, None)
+    return np.sum((actual - expected) * np.log(actual / expected), axis=-1)
+
+
+def binned_ks(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Kolmogorov-Smirnov distance per row, evaluated at the bin edges"""
+    return np.max(np.abs(np.cumsum(actual, axis=-1) - np.cumsum(expected, axis=-1)), axis=-1)
+
+
+def drift_status(psi: float) -> str:
+    """Classify a PSI value"""
+    if psi < PSI_MODERATE:
+        return "stable"
+    elif psi < PSI_SIGNIFICANT:
+        return "moderate"
+    else:
+        return "significant"
+
+
+class DriftMonitor:
+    """Fixed-memory streaming histograms of live inputs and predictions"""
+
+    def __init__(self, profile: Dict):
+        self.profile = profile
+        self.features = profile['features']
+        self.n_bins = profile['n_bins']
+
+        # Row 0..n_features-1: input features, last row: predicted RUL
+        histograms = [profile['histograms'][col] for col in self.features] + [profile['prediction']]
+        self.edges = np.array([h['edges'] for h in histograms])
+        self.reference = np.array([h['proportions'] for h in histograms])
+        self.ref_min = np.array([h['min'] for h in histograms])
+        self.ref_max = np.array([h['max'] for h in histograms])
+        self.ref_mean = np.array([h['mean'] for h in histograms])
+        self.ref_variance = np.array([h['variance'] for h in histograms])
+        self._offsets = np.arange(len(histograms)) * self.n_bins
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop all live statistics"""
+        n_vars = len(self.edges)
+        with self._lock:
+            self.counts = np.zeros((n_vars, self.n_bins), dtype=np.int64)
+            self.out_of_range = np.zeros(n_vars, dtype=np.int64)
+            self.non_finite = np.zeros(n_vars, dtype=np.int64)
+            self.n_finite = np.zeros(n_vars, dtype=np.int64)
+            self.sum = np.zeros(n_vars)
+            self.sum_sq = np.zeros(n_vars)
+            self.n_rows = 0
+
+    def update(self, data: pd.DataFrame, predictions: np.ndarray):
+        """Add a batch of readings and their predicted RUL"""
+        columns = data.columns.get_indexer(self.features)
+        values = np.column_stack([
+            data.to_numpy(dtype=np.float64)[:, columns],
+            np.asarray(predictions, dtype=np.float64),
+        ])
+        # Non-finite values are only counted as such, not binned or summed
+        finite = np.isfinite(values)
+        clean = np.where(finite, values, 0.0)
+
+        bins = self._bin_indices(clean)
+        counts = np.bincount((bins + self._offsets)[finite], minlength=self.counts.size)
+        out_of_range = ((clean < self.ref_min) | (clean > self.ref_max)) & finite
+        n_finite = finite.sum(axis=0)
+
+        with self._lock:
+            self.counts += counts.reshape(self.counts.shape)
+            self.out_of_range += out_of_range.sum(axis=0)
+            self.non_finite += len(values) - n_finite
+            self.n_finite += n_finite
+            self.sum += clean.sum(axis=0)
+            self.sum_sq += np.square(clean).sum(axis=0)
+            self.n_rows += len(values)
+
+    def _bin_indices(self, values: np.ndarray) -> np.ndarray:
+        """Histogram bin of every value, shape (n_rows, n_variables)"""
+        if len(values) <= SMALL_BATCH:
+            # One broadcast comparison against all edges is cheapest for few rows
+            return (values[:, :, None] >= self.edges).sum(axis=-1)
+        return np.column_stack([
+            np.searchsorted(edges, values[:, j], side='right') for j, edges in enumerate(self.edges)
+        ])
+
+    def report(self) -> Dict:
+        """PSI/KS of every variable against the reference profile"""
+        with self._lock:
+            counts = self.counts.copy()
+            out_of_range = self.out_of_range.copy()
+            non_finite = self.non_finite.copy()
+            n = self.n_rows
+            # Statistics of each variable cover its finite values only
+            n_finite = self.n_finite.copy()
+            mean = self.sum / np.maximum(n_finite, 1)
+            variance = (self.sum_sq - n_finite * mean ** 2) / np.maximum(n_finite - 1, 1)
+
+        if n == 0:
+            return {'n_observations': 0, 'status': 'no_data', 'features': {}, 'prediction': None}
+
+        # Variables without a single finite value have no live distribution yet
+        has_data = n_finite > 0
+        live = counts / np.maximum(n_finite, 1)[:, None]
+        psi = np.where(has_data, population_stability_index(self.reference, live), 0.0)
+        ks = np.where(has_data, binned_ks(self.reference, live), 0.0)
+
+        names = self.features + [PREDICTION]
+        entries = {}
+        for i, name in enumerate(names):
+            entries[name] = {
+                'psi': float(psi[i]),
+                'ks': float(ks[i]),
+                'status': drift_status(psi[i]) if has_data[i] else 'no_data',
+                'out_of_range_rate': float(out_of_range[i] / max(n_finite[i], 1)),
+                'non_finite': int(non_finite[i]),
+                'live_mean': float(mean[i]) if has_data[i] else None,
+                'reference_mean': float(self.ref_mean[i]),
+                'live_variance': float(variance[i]) if has_data[i] else None,
+                'reference_variance': float(self.ref_variance[i]),
+            }
+
+        # Features dropped for low variance that have started to vary
+        threshold = self.profile['variance_threshold']
+        activated = [
+            col for col in self.profile['low_variance_features']
+            if col in entries and (entries[col]['live_variance'] or 0.0) >= threshold
+        ]
+
+        worst = max(float(psi.max()), 0.0)
+        return {
+            'n_observations': n,
+            'status': drift_status(worst),
+            'max_psi': worst,
+            'drifted_features': [name for name in names[:-1]
+                                 if entries[name]['status'] not in ('stable', 'no_data')],
+            'low_variance_features_now_varying': activated,
+            'features': {name: entries[name] for name in names[:-1]},
+            'prediction': entries[PREDICTION],
+        }
+
+
+class MonitorRegistry:
+    """One DriftMonitor per model version that has a reference profile"""
+
+    def __init__(self):
+        self._monitors: Dict[str, DriftMonitor] = {}
+        self._lock = threading.Lock()
+
+    def get(self, version: str, metadata: Dict) -> Optional[DriftMonitor]:
+        """Monitor of a version, created from its metadata on first use"""
+        monitor = self._monitors.get(version)
+        if monitor is None and metadata.get('reference_profile'):
+            with self._lock:
+                monitor = self._monitors.setdefault(
+                    version, DriftMonitor(metadata['reference_profile'])
+                )
+        return monitor
+
+    def versions(self) -> List[str]:
+        """Versions with live statistics"""
+        return sorted(self._monitors)
+
+    def reset(self, version: Optional[str] = None):
+        """Reset one version's monitor, or all of them"""
+        for name, monitor in list(self._monitors.items()):
+            if version is None or name == version:
+                monitor.reset()
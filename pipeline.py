@@ -0,0 +1,305 @@
+"""
+Cached, Resumable Stage Pipeline for Turbofan Engine RUL Prediction
+
+A ``Pipeline`` is a DAG of ``Stage`` functions with named inputs and
+outputs. Every stage gets a cache key hashed from its code, its parameters,
+the contents of the files it declares (data files, helper modules) and the
+keys of the stages it depends on, so a change only invalidates the stages
+downstream of it. Stage outputs are pickled
+under the cache directory and only loaded when a stage that actually has
+to run needs them. Independent stages run in parallel on a thread pool,
+and each stage records its wall time and peak memory. Memory is the
+process's resident set size sampled on a background thread, so native
+allocations (NumPy, XGBoost, PyTorch) count and stages run at full speed.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+CACHE_DIR = Path('.cache/pipeline')
+
+# Seconds between resident memory samples while stages run
+MEMORY_SAMPLE_INTERVAL = 0.01
+
+
+def resident_memory() -> int:
+    """Resident set size of this process in bytes (0 where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+def file_hash(path: Path) -> str:
+    """Content hash of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class Stage:
+    """One pipeline step: fn(**inputs, **params) -> {output_name: value}"""
+    name: str
+    fn: Callable[..., Dict[str, Any]]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+    files: List[Path] = field(default_factory=list)  # hashed into the key, not passed to fn
+    cache: bool = True
+    valid: Optional[Callable[[Dict[str, Any]], bool]] = None  # cached outputs reused only if valid
+
+
+@dataclass
+class StageStats:
+    """Execution record of one stage"""
+    name: str
+    status: str = 'pending'  # 'ran', 'cached' or 'skipped'
+    wall_time: float = 0.0
+    peak_memory_mb: float = 0.0
+
+
+class Pipeline:
+    """DAG of stages with content-hash caching and parallel execution"""
+
+    def __init__(self, stages: List[Stage], cache_dir: Path = CACHE_DIR, use_cache: bool = True,
+                 max_workers: int = os.cpu_count() or 1, log: Callable[[str], None] = print):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = Path(cache_dir)
+        self.use_cache = use_cache
+        self.max_workers = max_workers
+        self.log = log
+
+        # Which stage produces each artifact
+        self.producers: Dict[str, str] = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"Artifact '{output}' is produced by more than one stage")
+                self.producers[output] = stage.name
+        for stage in stages:
+            missing = [i for i in stage.inputs if i not in self.producers]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' needs unknown artifacts: {missing}")
+
+        self.order = self._topological_order()
+        self.keys = self._cache_keys()
+        self.stats = {name: StageStats(name) for name in self.order}
+        self._memory_lock = threading.Lock()
+        self._peaks: Dict[str, int] = {}  # running stage -> highest RSS sampled
+
+    # ------------------------------------------------------------------
+    # Graph
+    # ------------------------------------------------------------------
+
+    def dependencies(self, name: str) -> List[str]:
+        """Stages whose outputs the given stage consumes"""
+        return sorted({self.producers[i] for i in self.stages[name].inputs})
+
+    def _topological_order(self) -> List[str]:
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle through stage '{name}'")
+            visiting.add(name)
+            for dep in self.dependencies(name):
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def _cache_keys(self) -> Dict[str, str]:
+        keys = {}
+        for name in self.order:
+            stage = self.stages[name]
+            payload = json.dumps({
+                'name': name,
+                'code': inspect.getsource(stage.fn),
+                'params': stage.params,
+                'files': {str(path): file_hash(path) for path in stage.files},
+                'inputs': {i: keys[self.producers[i]] for i in stage.inputs},
+            }, sort_keys=True, default=repr)
+            keys[name] = hashlib.sha256(payload.encode()).hexdigest()[:16]
+        return keys
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cache_path(self, name: str) -> Path:
+        return self.cache_dir / name / f'{self.keys[name]}.pkl'
+
+    def _is_cached(self, name: str) -> bool:
+        stage = self.stages[name]
+        if not (self.use_cache and stage.cache and self._cache_path(name).exists()):
+            return False
+        return stage.valid is None or stage.valid(self._load_cached(name))
+
+    def _load_cached(self, name: str) -> Dict[str, Any]:
+        with open(self._cache_path(name), 'rb') as f:
+            return pickle.load(f)
+
+    def _store(self, name: str, outputs: Dict[str, Any]):
+        if not self.stages[name].cache:
+            return
+        path = self._cache_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(outputs, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _plan(self, targets: List[str]):
+        """Stages to execute and cached stages whose outputs must be loaded"""
+        to_run, to_load = set(), set()
+
+        def need(name):
+            if name in to_run or name in to_load:
+                return
+            if self._is_cached(name):
+                to_load.add(name)
+                return
+            to_run.add(name)
+            for dep in self.dependencies(name):
+                need(dep)
+
+        for name in targets:
+            need(name)
+        return to_run, to_load
+
+    def final_stages(self) -> List[str]:
+        """Stages whose outputs no other stage consumes"""
+        consumed = {dep for name in self.order for dep in self.dependencies(name)}
+        return [name for name in self.order if name not in consumed]
+
+    def run(self, targets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Bring the target stages (default: the final ones) up to date.
+
+        Returns the artifacts of the targets and of every stage that was
+        run or loaded for them; cached stages nothing needs are skipped.
+        """
+        targets = targets or self.final_stages()
+        to_run, to_load = self._plan(targets)
+        artifacts: Dict[str, Any] = {}
+
+        for name in self.order:
+            if name in to_load:
+                start = time.perf_counter()
+                artifacts.update(self._load_cached(name))
+                self.stats[name].status = 'cached'
+                self.stats[name].wall_time = time.perf_counter() - start
+                self.log(f"[cached] {name}")
+            elif name not in to_run:
+                self.stats[name].status = 'skipped'
+
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample_memory, args=(stop,), daemon=True)
+        sampler.start()
+        try:
+            self._execute(to_run, artifacts)
+        finally:
+            stop.set()
+            sampler.join()
+        return artifacts
+
+    def _sample_memory(self, stop: threading.Event):
+        """Raise the peak of every running stage to the current RSS until stopped"""
+        while not stop.wait(MEMORY_SAMPLE_INTERVAL):
+            self._record_memory()
+
+    def _record_memory(self):
+        rss = resident_memory()
+        with self._memory_lock:
+            for name, peak in self._peaks.items():
+                self._peaks[name] = max(peak, rss)
+
+    def _execute(self, to_run: set, artifacts: Dict[str, Any]):
+        pending = [name for name in self.order if name in to_run]
+        finished = set(name for name in self.order if name not in to_run)
+        total, started = len(pending), 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                ready = [n for n in pending if all(d in finished for d in self.dependencies(n))]
+                for name in ready:
+                    pending.remove(name)
+                    started += 1
+                    self.log(f"\n[{started}/{total}] {name}...")
+                    stage = self.stages[name]
+                    kwargs = {i: artifacts[i] for i in stage.inputs}
+                    running[executor.submit(self._run_stage, stage, kwargs)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outputs = future.result()
+                    artifacts.update(outputs)
+                    self._store(name, outputs)
+                    finished.add(name)
+
+    def _run_stage(self, stage: Stage, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        baseline = resident_memory()
+        with self._memory_lock:
+            self._peaks[stage.name] = baseline
+
+        start = time.perf_counter()
+        try:
+            outputs = stage.fn(**kwargs, **stage.params) or {}
+        finally:
+            self._record_memory()
+            with self._memory_lock:
+                peak = self._peaks.pop(stage.name)
+
+        missing = set(stage.outputs) - set(outputs)
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' did not produce: {sorted(missing)}")
+
+        stats = self.stats[stage.name]
+        stats.status = 'ran'
+        stats.wall_time = time.perf_counter() - start
+        stats.peak_memory_mb = max(0, peak - baseline) / 1e6
+        return {name: outputs[name] for name in stage.outputs}
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def report(self) -> str:
+        """Table of per-stage status, wall time and peak memory above the stage's start"""
+        lines = [f"{'Stage':<22} {'Status':<8} {'Wall time':>10} {'Peak mem':>10}",
+                 "-" * 53]
+        for name in self.order:
+            s = self.stats[name]
+            lines.append(f"{name:<22} {s.status:<8} {s.wall_time:>9.2f}s {s.peak_memory_mb:>8.1f}MB")
+        return "\n".join(lines)
+
+    def save_report(self, path: Path):
+        """Write per-stage stats and cache keys as JSON"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            name: {**vars(self.stats[name]), 'cache_key': self.keys[name]} for name in self.order
+        }, indent=2))
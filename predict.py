@@ -5,15 +5,22 @@ This service provides REST API endpoints for predicting
 Remaining Useful Life (RUL) of turbofan engines.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Header, Query
 from pydantic import BaseModel, Field
-from typing import List, Dict
+from typing import List, Dict, Optional
 import pandas as pd
 import numpy as np
-import pickle
+import os
+import hmac
 from pathlib import Path
 import logging
 
+from features import FeatureStore, add_rolling_features
+from model_registry import ModelRegistry, ModelServer, ModelState, RoutingTable
+from monitoring import MonitorRegistry
+from explain import ContributionExplainer, ExplanationJobs
+from fleet_index import FleetIndex, MAX_UNIT_ID
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,44 +35,55 @@ app = FastAPI(
 # Model directory
 MODEL_DIR = Path('models')
 
-# Global variables for model and artifacts
-model = None
-scaler = None
-config = None
-metadata = None
+# Versioned model registry (falls back to the flat artifacts in MODEL_DIR)
+REGISTRY_DIR = Path(os.getenv('MODEL_REGISTRY_DIR', str(MODEL_DIR / 'registry')))
+
+# Seconds between checks of the registry ACTIVE pointer (0 disables the watcher)
+MODEL_WATCH_INTERVAL = float(os.getenv('MODEL_WATCH_INTERVAL', '0'))
+
+# Holds the immutable routing table of loaded model versions
+registry = ModelRegistry(REGISTRY_DIR, fallback_dir=MODEL_DIR)
+model_server = ModelServer(registry)
+
+# Streaming drift monitors, one per model version with a reference profile
+monitors = MonitorRegistry()
+
+# TreeSHAP explanations, cached per input window, and background jobs;
+# batches larger than EXPLAIN_MAX_ROWS must go through /explain/jobs
+explainer = ContributionExplainer()
+explanation_jobs = ExplanationJobs()
+EXPLAIN_MAX_ROWS = 1000
+
+# Optional feature store of raw readings: incoming readings are appended to it
+# so models are scored on each engine's stored history instead of just the request
+FEATURE_STORE_DIR = os.getenv('FEATURE_STORE_DIR')
+feature_store: Optional[FeatureStore] = None
+
+# Latest prediction per engine, sorted by RUL for fleet queries; restored
+# from FLEET_INDEX_PATH at startup and snapshotted there periodically
+FLEET_INDEX_PATH = os.getenv('FLEET_INDEX_PATH')
+FLEET_SNAPSHOT_INTERVAL = float(os.getenv('FLEET_SNAPSHOT_INTERVAL', '300'))
+FLEET_MAX_RESULTS = 10_000
+fleet_index = FleetIndex()
+
+# Shared secret for the endpoints that change server state, sent in the
+# X-Admin-Token header; while it is unset those endpoints are disabled
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
 
 # ============================================================================
 # LOAD MODEL AND ARTIFACTS
 # ============================================================================
 
-def load_model_artifacts():
-    """Load model and all necessary artifacts"""
-    global model, scaler, config, metadata
-    
+def load_model_artifacts(version: Optional[str] = None) -> ModelState:
+    """Load model and all necessary artifacts and start serving them"""
     try:
-        # Load model
-        with open(MODEL_DIR / 'xgboost_rul_model.pkl', 'rb') as f:
-            model = pickle.load(f)
-        logger.info("✓ Model loaded successfully")
-        
-        # Load scaler
-        with open(MODEL_DIR / 'scaler.pkl', 'rb') as f:
-            scaler = pickle.load(f)
-        logger.info("✓ Scaler loaded successfully")
-        
-        # Load configuration
-        with open(MODEL_DIR / 'config.pkl', 'rb') as f:
-            config = pickle.load(f)
-        logger.info("✓ Configuration loaded successfully")
-        
-        # Load metadata
-        with open(MODEL_DIR / 'model_metadata.pkl', 'rb') as f:
-            metadata = pickle.load(f)
-        logger.info("✓ Metadata loaded successfully")
-        
-        logger.info(f"Model type: {metadata['model_type']}")
-        logger.info(f"Test RMSE: {metadata['test_rmse']:.4f}")
-        logger.info(f"Number of features: {metadata['n_features']}")
+        state = model_server.load_primary(version)
+        logger.info("✓ Model, scaler, configuration and metadata loaded successfully")
+        logger.info(f"Model version: {state.version}")
+        logger.info(f"Model type: {state.metadata['model_type']}")
+        logger.info(f"Test RMSE: {state.metadata['test_rmse']:.4f}")
+        logger.info(f"Number of features: {state.metadata['n_features']}")
+        return state
         
     except Exception as e:
         logger.error(f"Error loading model artifacts: {e}")
@@ -77,7 +95,7 @@ def load_model_artifacts():
 
 class SensorReading(BaseModel):
     """Single sensor reading for one time cycle"""
-    unit_id: int = Field(..., description="Engine unit identifier", ge=1)
+    unit_id: int = Field(..., description="Engine unit identifier", ge=1, le=MAX_UNIT_ID)
     time_cycles: int = Field(..., description="Current time cycle", ge=1)
     setting_1: float = Field(..., description="Operational setting 1")
     setting_2: float = Field(..., description="Operational setting 2")
@@ -140,50 +158,89 @@ class BatchSensorReadings(BaseModel):
     """Multiple sensor readings for batch prediction"""
     readings: List[SensorReading] = Field(..., description="List of sensor readings")
 
+class UnitScoreRequest(BaseModel):
+    """Engines to score from the feature store"""
+    unit_ids: Optional[List[int]] = Field(None, description="Engine units (default: all stored)")
+    start_cycle: Optional[int] = Field(None, description="First cycle to score", ge=1)
+    end_cycle: Optional[int] = Field(None, description="Last cycle to score", ge=1)
+
 class PredictionResponse(BaseModel):
     """Response model for predictions"""
     unit_id: int
+    time_cycles: Optional[int] = None
     predicted_rul: float
     confidence: str
+    model_version: Optional[str] = None
+    warning: Optional[str] = Field(None, description="Set when scored on less history than the model expects")
 
 class BatchPredictionResponse(BaseModel):
     """Response model for batch predictions"""
     predictions: List[PredictionResponse]
     total_predictions: int
 
+class Explanation(BaseModel):
+    """Per-feature contributions (TreeSHAP) to one prediction"""
+    unit_id: int
+    time_cycles: int
+    predicted_rul: float
+    base_value: float = Field(..., description="Expected model output before any feature")
+    contributions: Dict[str, float] = Field(..., description="Feature contributions in cycles")
+    model_version: str
+    routed_version: Optional[str] = Field(
+        None, description="Version serving this engine if it cannot be explained (model_version explained it)"
+    )
+
+class ExplanationResponse(BaseModel):
+    """Response model for explanations"""
+    explanations: List[Explanation]
+    total_explanations: int
+    cached: int = Field(..., description="Explanations served from the cache")
+
+class FleetQueryResponse(BaseModel):
+    """Engines matching a fleet query, lowest predicted RUL first"""
+    predictions: List[PredictionResponse]
+    total_matches: int = Field(..., description="Matching engines, including those beyond the limit")
+    fleet_size: int
+
+class ExplanationJobResponse(BaseModel):
+    """Status of a background explanation job"""
+    job_id: str
+    status: str
+    n_rows: int
+    result: Optional[ExplanationResponse] = None
+    error: Optional[str] = None
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
     model_loaded: bool
     model_type: str = None
     test_rmse: float = None
+    model_version: Optional[str] = None
+
+class ModelLoadRequest(BaseModel):
+    """Request to load a registry version in the background"""
+    version: str = Field(..., description="Registry version to load")
+    target: str = Field("primary", description="'primary' or 'candidate'",
+                        pattern="^(primary|candidate)$")
+    traffic_percent: float = Field(10.0, description="Share of engines routed to a candidate",
+                                   ge=0, le=100)
+
+class TrafficSplitRequest(BaseModel):
+    """Request to change the candidate traffic share"""
+    traffic_percent: float = Field(..., description="Share of engines routed to the candidate",
+                                   ge=0, le=100)
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def add_rolling_features(df, sensor_cols, window=5):
-    """Add rolling mean and std features for sensors"""
-    df_roll = df.copy()
-    
-    for sensor in sensor_cols:
-        # Rolling mean
-        df_roll[f'{sensor}_rolling_mean'] = df_roll.groupby('unit_id')[sensor].transform(
-            lambda x: x.rolling(window=window, min_periods=1).mean()
-        )
-        
-        # Rolling std
-        df_roll[f'{sensor}_rolling_std'] = df_roll.groupby('unit_id')[sensor].transform(
-            lambda x: x.rolling(window=window, min_periods=1).std()
-        )
-    
-    # Fill NaN in rolling std with 0
-    df_roll = df_roll.fillna(0)
-    
-    return df_roll
-
-def prepare_features(data: pd.DataFrame) -> pd.DataFrame:
+def prepare_features(data: pd.DataFrame, config: Dict) -> pd.DataFrame:
     """Prepare features for prediction"""
+    # Sequence models build their own cycle windows from the raw readings
+    if config.get('model_family') == 'sequence':
+        return data[['unit_id', 'time_cycles'] + config['all_features']]
+    
     # Add rolling features
     df_processed = add_rolling_features(data, config['top_sensors'], window=config['rolling_window'])
     
@@ -192,6 +249,97 @@ def prepare_features(data: pd.DataFrame) -> pd.DataFrame:
     
     return X
 
+def history_length(config: Dict) -> int:
+    """Cycles of an engine's history a model looks at for one prediction"""
+    if config.get('model_family') == 'sequence':
+        return config['sequence_length']
+    return config['rolling_window']
+
+def with_history(data: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    """Readings preceded by the stored cycles the model needs (read-only).
+    
+    ``_row`` is each reading's position in data and -1 for stored history.
+    Without a feature store only the request's own cycles are available.
+    """
+    if feature_store is None:
+        return data.reset_index(drop=True).assign(_row=np.arange(len(data)))
+    return feature_store.with_history(data, history_length(config) - 1)
+
+def request_rows(context: pd.DataFrame) -> np.ndarray:
+    """Positions of the request's readings in a with_history frame, in request order"""
+    rows = context['_row'].to_numpy()
+    positions = np.flatnonzero(rows >= 0)
+    return positions[np.argsort(rows[positions], kind='stable')]
+
+def predict_rows(state: ModelState, data: pd.DataFrame):
+    """Predicted RUL of each reading and the cycles of history it was scored on"""
+    context = with_history(data, state.config)
+    preds = state.model.predict(prepare_features(context, state.config))
+    history = context.groupby('unit_id').cumcount().to_numpy() + 1
+    
+    rows = request_rows(context)
+    return preds[rows], np.minimum(history[rows], history_length(state.config))
+
+def history_warning(available: int, needed: int) -> Optional[str]:
+    """Warning for a prediction scored on less history than the model expects"""
+    if available >= needed:
+        return None
+    return (f"Scored on {available} of {needed} cycles of history; send the preceding "
+            f"cycles or enable the feature store (FEATURE_STORE_DIR)")
+
+def store_readings(data: pd.DataFrame):
+    """Append scored readings to the feature store, if enabled"""
+    if feature_store is not None:
+        feature_store.append(data)
+
+def explain_readings(routing: RoutingTable, data: pd.DataFrame,
+                     approximate: bool = False) -> ExplanationResponse:
+    """TreeSHAP contributions for each row, batched per model version"""
+    row_versions, states = route_rows(routing, data)
+    routed_versions = row_versions.copy()
+    
+    # Rows routed to a model without contributions (e.g. a sequence canary) are
+    # explained by a served XGBoost version instead, the primary first
+    unsupported = [v for v, state in states.items() if not explainer.supports(state.model)]
+    if unsupported:
+        fallback = next((s for s in (routing.primary, routing.candidate)
+                         if s is not None and explainer.supports(s.model)), None)
+        if fallback is None:
+            raise TypeError("Explanations are only available for XGBoost models")
+        row_versions = row_versions.where(~row_versions.isin(unsupported), fallback.version)
+        states = {v: s for v, s in states.items() if v not in unsupported}
+        states[fallback.version] = fallback
+    
+    explanations = [None] * len(data)
+    n_cached = 0
+    for state in states.values():
+        mask = (row_versions == state.version).to_numpy()
+        context = with_history(data[mask], state.config)
+        X = prepare_features(context, state.config).iloc[request_rows(context)]
+        contribs, cached = explainer.explain(state.model, X, state.version, approximate)
+        n_cached += cached
+        
+        features = list(X.columns)
+        rows = data.loc[mask, ['unit_id', 'time_cycles']].to_numpy()
+        routed = routed_versions[mask].tolist()
+        for idx, (unit_id, cycle), row, version in zip(np.flatnonzero(mask), rows,
+                                                       contribs.tolist(), routed):
+            explanations[idx] = Explanation(
+                unit_id=int(unit_id),
+                time_cycles=int(cycle),
+                predicted_rul=max(0.0, sum(row)),
+                base_value=row[-1],
+                contributions=dict(zip(features, row[:-1])),
+                model_version=state.version,
+                routed_version=None if version == state.version else version
+            )
+    
+    return ExplanationResponse(
+        explanations=explanations,
+        total_explanations=len(explanations),
+        cached=n_cached
+    )
+
 def get_confidence_level(rul_value: float) -> str:
     """Determine confidence level based on RUL value"""
     if rul_value < 30:
@@ -201,6 +349,48 @@ def get_confidence_level(rul_value: float) -> str:
     else:
         return "low"
 
+def get_routing() -> RoutingTable:
+    """Snapshot of the loaded model versions for the current request"""
+    routing = model_server.routing()
+    if routing is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+    return routing
+
+def route_rows(routing: RoutingTable, data: pd.DataFrame):
+    """Model version of each row, and the states of the versions involved"""
+    unit_states = {uid: routing.select(uid) for uid in data['unit_id'].unique()}
+    row_versions = data['unit_id'].map(lambda uid: unit_states[uid].version)
+    return row_versions, {s.version: s for s in unit_states.values()}
+
+def run_predictions(routing: RoutingTable, data: pd.DataFrame, monitor: bool = True):
+    """Predict RUL for each row, routing each engine to its model version"""
+    row_versions, states = route_rows(routing, data)
+    
+    rul_preds = np.empty(len(data))
+    warnings: List[Optional[str]] = [None] * len(data)
+    for state in states.values():
+        mask = (row_versions == state.version).to_numpy()
+        preds, available = predict_rows(state, data[mask])
+        
+        # Ensure non-negative RUL
+        rul_preds[mask] = np.maximum(0, preds)
+        
+        # Flag rows scored on fewer cycles than the model expects
+        needed = np.minimum(history_length(state.config), data.loc[mask, 'time_cycles'].to_numpy())
+        for idx, have, need in zip(np.flatnonzero(mask), available, needed):
+            warnings[idx] = history_warning(int(have), int(need))
+        
+        # Stream inputs and predictions into the version's drift monitor
+        drift_monitor = monitors.get(state.version, state.metadata) if monitor else None
+        if drift_monitor is not None:
+            drift_monitor.update(data[mask], rul_preds[mask])
+    
+    # Keep each engine's latest prediction for fleet queries
+    versions = row_versions.tolist()
+    fleet_index.update(data['unit_id'].to_numpy(), data['time_cycles'].to_numpy(), rul_preds, versions)
+    
+    return rul_preds, versions, warnings
+
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
@@ -208,10 +398,33 @@ def get_confidence_level(rul_value: float) -> str:
 @app.on_event("startup")
 async def startup_event():
     """Load model on startup"""
+    global feature_store, fleet_index
     logger.info("Starting up Turbofan RUL Prediction API...")
     load_model_artifacts()
+    if FEATURE_STORE_DIR:
+        # Served models compute their own rolling features, so only raw readings are stored
+        feature_store = FeatureStore(Path(FEATURE_STORE_DIR), sensors=[])
+        logger.info(f"✓ Feature store opened at {FEATURE_STORE_DIR} ({len(feature_store)} rows)")
+    if FLEET_INDEX_PATH:
+        if Path(FLEET_INDEX_PATH).exists():
+            fleet_index = FleetIndex.load(Path(FLEET_INDEX_PATH))
+            logger.info(f"✓ Fleet index restored from {FLEET_INDEX_PATH} ({len(fleet_index)} engines)")
+        if FLEET_SNAPSHOT_INTERVAL > 0:
+            fleet_index.start_snapshots(Path(FLEET_INDEX_PATH), FLEET_SNAPSHOT_INTERVAL)
+    if MODEL_WATCH_INTERVAL > 0:
+        model_server.start_watching(MODEL_WATCH_INTERVAL)
     logger.info("API is ready to serve predictions!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background model watcher and persist buffered features and fleet index"""
+    model_server.stop_watching()
+    if feature_store is not None:
+        feature_store.flush()
+    if FLEET_INDEX_PATH:
+        fleet_index.stop_snapshots()
+        fleet_index.save(Path(FLEET_INDEX_PATH))
+
 @app.get("/", response_model=Dict)
 async def root():
     """Root endpoint"""
@@ -222,7 +435,12 @@ async def root():
             "health": "/health",
             "predict": "/predict",
             "predict_batch": "/predict/batch",
+            "predict_units": "/predict/units",
+            "fleet": "/fleet/lowest",
+            "explain": "/explain",
             "model_info": "/model/info",
+            "drift": "/monitoring/drift",
+            "admin_models": "/admin/models",
             "docs": "/docs"
         }
     }
@@ -230,22 +448,28 @@ async def root():
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    model_loaded = model is not None and scaler is not None
+    routing = model_server.routing()
+    model_loaded = routing is not None
+    metadata = routing.primary.metadata if model_loaded else {}
     
     return HealthResponse(
         status="healthy" if model_loaded else "unhealthy",
         model_loaded=model_loaded,
         model_type=metadata.get('model_type') if model_loaded else None,
-        test_rmse=metadata.get('test_rmse') if model_loaded else None
+        test_rmse=metadata.get('test_rmse') if model_loaded else None,
+        model_version=routing.primary.version if model_loaded else None
     )
 
 @app.get("/model/info", response_model=Dict)
 async def model_info():
     """Get model information"""
-    if metadata is None:
+    routing = model_server.routing()
+    if routing is None:
         raise HTTPException(status_code=500, detail="Model metadata not loaded")
+    metadata = routing.primary.metadata
     
     return {
+        "model_version": routing.primary.version,
         "model_type": metadata.get('model_type'),
         "dataset": metadata.get('dataset'),
         "n_features": metadata.get('n_features'),
@@ -261,29 +485,27 @@ async def model_info():
 @app.post("/predict", response_model=PredictionResponse)
 async def predict(reading: SensorReading):
     """Predict RUL for a single sensor reading"""
-    if model is None or scaler is None:
-        raise HTTPException(status_code=500, detail="Model not loaded")
+    routing = get_routing()
     
     try:
         # Convert to DataFrame
         data = pd.DataFrame([reading.dict()])
         
-        # Prepare features
-        X = prepare_features(data)
-        
-        # Make prediction
-        rul_pred = model.predict(X)[0]
-        
-        # Ensure non-negative RUL
-        rul_pred = max(0, rul_pred)
+        # Make prediction, then add the reading to its engine's history
+        rul_preds, versions, warnings = run_predictions(routing, data)
+        store_readings(data)
+        rul_pred = rul_preds[0]
         
         # Get confidence
         confidence = get_confidence_level(rul_pred)
         
         return PredictionResponse(
             unit_id=reading.unit_id,
+            time_cycles=reading.time_cycles,
             predicted_rul=float(rul_pred),
-            confidence=confidence
+            confidence=confidence,
+            model_version=versions[0],
+            warning=warnings[0]
         )
         
     except Exception as e:
@@ -293,29 +515,26 @@ async def predict(reading: SensorReading):
 @app.post("/predict/batch", response_model=BatchPredictionResponse)
 async def predict_batch(batch: BatchSensorReadings):
     """Predict RUL for multiple sensor readings"""
-    if model is None or scaler is None:
-        raise HTTPException(status_code=500, detail="Model not loaded")
+    routing = get_routing()
     
     try:
         # Convert to DataFrame
         data = pd.DataFrame([reading.dict() for reading in batch.readings])
         
-        # Prepare features
-        X = prepare_features(data)
-        
-        # Make predictions
-        rul_preds = model.predict(X)
-        
-        # Ensure non-negative RUL
-        rul_preds = np.maximum(0, rul_preds)
+        # Make predictions, then add the readings to their engines' history
+        rul_preds, versions, warnings = run_predictions(routing, data)
+        store_readings(data)
         
         # Create response
         predictions = []
         for idx, reading in enumerate(batch.readings):
             predictions.append(PredictionResponse(
                 unit_id=reading.unit_id,
+                time_cycles=reading.time_cycles,
                 predicted_rul=float(rul_preds[idx]),
-                confidence=get_confidence_level(rul_preds[idx])
+                confidence=get_confidence_level(rul_preds[idx]),
+                model_version=versions[idx],
+                warning=warnings[idx]
             ))
         
         return BatchPredictionResponse(
@@ -327,6 +546,256 @@ async def predict_batch(batch: BatchSensorReadings):
         logger.error(f"Batch prediction error: {e}")
         raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
 
+@app.post("/predict/units", response_model=BatchPredictionResponse)
+async def predict_units(request: UnitScoreRequest):
+    """Score stored cycles from the feature store (latest cycle per unit by default)"""
+    routing = get_routing()
+    if feature_store is None:
+        raise HTTPException(status_code=409, detail="Feature store not enabled (set FEATURE_STORE_DIR)")
+    
+    try:
+        # Rows to score: a cycle range, or each unit's latest stored cycle
+        if request.start_cycle is None and request.end_cycle is None:
+            targets = feature_store.latest(request.unit_ids)
+        else:
+            targets = feature_store.read(request.unit_ids, request.start_cycle, request.end_cycle)
+        if targets.empty:
+            return BatchPredictionResponse(predictions=[], total_predictions=0)
+        
+        # Stored readings were already monitored when they arrived; the
+        # cycles each model needs before them come from the store as well
+        rul_preds, versions, warnings = run_predictions(routing, targets, monitor=False)
+        
+        predictions = [
+            PredictionResponse(
+                unit_id=int(unit_id),
+                time_cycles=int(cycle),
+                predicted_rul=float(rul),
+                confidence=get_confidence_level(rul),
+                model_version=version,
+                warning=warning
+            )
+            for unit_id, cycle, rul, version, warning in zip(
+                targets['unit_id'], targets['time_cycles'], rul_preds, versions, warnings
+            )
+        ]
+        
+        return BatchPredictionResponse(
+            predictions=predictions,
+            total_predictions=len(predictions)
+        )
+        
+    except Exception as e:
+        logger.error(f"Feature store scoring error: {e}")
+        raise HTTPException(status_code=500, detail=f"Feature store scoring failed: {str(e)}")
+
+# ============================================================================
+# ADMIN AUTHENTICATION
+# ============================================================================
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject requests without the admin token (all of them if ADMIN_TOKEN is unset)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (set ADMIN_TOKEN)")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Missing or invalid X-Admin-Token header")
+
+# ============================================================================
+# FLEET QUERIES
+# ============================================================================
+
+def fleet_response(result) -> FleetQueryResponse:
+    """Build the response of a fleet index query"""
+    engines, total = result
+    predictions = [
+        PredictionResponse(
+            unit_id=int(unit_id),
+            time_cycles=int(cycle),
+            predicted_rul=float(rul),
+            confidence=get_confidence_level(rul),
+            model_version=version or None
+        )
+        for unit_id, cycle, rul, version in zip(
+            engines['unit_id'], engines['time_cycles'], engines['predicted_rul'], engines['model_version']
+        )
+    ]
+    return FleetQueryResponse(predictions=predictions, total_matches=total, fleet_size=len(fleet_index))
+
+def require_finite(**bounds: Optional[float]):
+    """Reject NaN/inf query bounds, which would match all engines or none"""
+    for name, value in bounds.items():
+        if value is not None and not np.isfinite(value):
+            raise HTTPException(status_code=400, detail=f"{name} must be a finite number")
+
+@app.get("/fleet/lowest", response_model=FleetQueryResponse)
+async def fleet_lowest(k: int = Query(50, ge=1, le=FLEET_MAX_RESULTS)):
+    """The k engines with the lowest latest predicted RUL"""
+    return fleet_response(fleet_index.lowest(k))
+
+@app.get("/fleet/below", response_model=FleetQueryResponse)
+async def fleet_below(threshold: float,
+                      limit: int = Query(1000, ge=1, le=FLEET_MAX_RESULTS)):
+    """Engines whose latest predicted RUL is below a threshold, lowest first"""
+    require_finite(threshold=threshold)
+    return fleet_response(fleet_index.below(threshold, limit))
+
+@app.get("/fleet/range", response_model=FleetQueryResponse)
+async def fleet_range(min_rul: float = 0.0, max_rul: Optional[float] = None,
+                      limit: int = Query(1000, ge=1, le=FLEET_MAX_RESULTS)):
+    """Engines whose latest predicted RUL is within [min_rul, max_rul], lowest first"""
+    require_finite(min_rul=min_rul, max_rul=max_rul)
+    max_rul = np.inf if max_rul is None else max_rul
+    if min_rul > max_rul:
+        raise HTTPException(status_code=400, detail="min_rul must not exceed max_rul")
+    return fleet_response(fleet_index.between(min_rul, max_rul, limit))
+
+@app.post("/fleet/snapshot", response_model=Dict, dependencies=[Depends(require_admin)])
+async def fleet_snapshot():
+    """Write the fleet index to FLEET_INDEX_PATH now"""
+    if not FLEET_INDEX_PATH:
+        raise HTTPException(status_code=409, detail="Fleet snapshots not enabled (set FLEET_INDEX_PATH)")
+    fleet_index.save(Path(FLEET_INDEX_PATH))
+    return {"path": FLEET_INDEX_PATH, "engines": len(fleet_index)}
+
+# ============================================================================
+# EXPLANATIONS
+# ============================================================================
+
+@app.post("/explain", response_model=ExplanationResponse)
+def explain(batch: BatchSensorReadings, approximate: bool = False):
+    """Per-feature contributions (TreeSHAP, or faster approximate) for each reading"""
+    # A plain def runs in the threadpool, so TreeSHAP never blocks the event loop
+    routing = get_routing()
+    if len(batch.readings) > EXPLAIN_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {EXPLAIN_MAX_ROWS} readings per request; use /explain/jobs for larger batches"
+        )
+    
+    try:
+        # Explaining a reading must not write it into the engine's history
+        data = pd.DataFrame([reading.dict() for reading in batch.readings])
+        return explain_readings(routing, data, approximate)
+        
+    except TypeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Explanation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Explanation failed: {str(e)}")
+
+@app.post("/explain/jobs", response_model=ExplanationJobResponse, status_code=202)
+async def submit_explain_job(batch: BatchSensorReadings, approximate: bool = False):
+    """Explain a large batch in the background; poll /explain/jobs/{job_id}"""
+    routing = get_routing()
+    data = pd.DataFrame([reading.dict() for reading in batch.readings])
+    
+    job_id = explanation_jobs.submit(lambda: explain_readings(routing, data, approximate),
+                                     n_rows=len(data))
+    return ExplanationJobResponse(job_id=job_id, status="queued", n_rows=len(data))
+
+@app.get("/explain/jobs/{job_id}", response_model=ExplanationJobResponse)
+async def get_explain_job(job_id: str):
+    """Status and, once done, result of a background explanation job"""
+    job = explanation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown explanation job: {job_id}")
+    return ExplanationJobResponse(job_id=job_id, **job)
+
+# ============================================================================
+# MONITORING
+# ============================================================================
+
+@app.get("/monitoring/drift", response_model=Dict)
+async def drift_report(version: Optional[str] = None):
+    """Compare live inputs and predictions with the training reference profile"""
+    routing = get_routing()
+    states = {s.version: s for s in (routing.primary, routing.candidate) if s is not None}
+    version = version or routing.primary.version
+    if version not in states:
+        raise HTTPException(status_code=404, detail=f"Model version not being served: {version}")
+    
+    drift_monitor = monitors.get(version, states[version].metadata)
+    if drift_monitor is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Model version {version} has no reference profile; retrain to enable monitoring"
+        )
+    
+    return {"model_version": version, **drift_monitor.report()}
+
+@app.post("/monitoring/reset", response_model=Dict, dependencies=[Depends(require_admin)])
+async def reset_monitoring(version: Optional[str] = None):
+    """Clear live monitoring statistics (one version or all)"""
+    monitors.reset(version)
+    return {"reset": version or "all"}
+
+# ============================================================================
+# MODEL REGISTRY ADMIN
+# ============================================================================
+
+def _background_load(request: ModelLoadRequest):
+    """Load a model version off the request path and swap it in"""
+    try:
+        if request.target == "candidate":
+            model_server.load_candidate(request.version, request.traffic_percent)
+        else:
+            # Persisted in ACTIVE so the registry watcher does not undo it
+            model_server.load_primary(request.version, persist=True)
+    except Exception as e:
+        logger.error(f"Loading model version {request.version} failed: {e}")
+
+@app.get("/admin/models", response_model=Dict)
+async def list_models():
+    """List registry versions and the current traffic routing"""
+    routing = model_server.routing()
+    return {
+        "versions": registry.list_versions(),
+        "active_version": registry.active_version(),
+        "primary": routing.primary.version if routing else None,
+        "candidate": routing.candidate.version if routing and routing.candidate else None,
+        "candidate_traffic_percent": routing.candidate_percent if routing else 0.0,
+        "load_status": dict(model_server.load_status)
+    }
+
+@app.post("/admin/models/load", response_model=Dict, status_code=202,
+          dependencies=[Depends(require_admin)])
+async def load_model(request: ModelLoadRequest, background_tasks: BackgroundTasks):
+    """Load a registry version in the background, then swap it in atomically"""
+    if request.target == "candidate" and model_server.routing() is None:
+        raise HTTPException(status_code=409, detail="No primary model loaded")
+    if not registry.has_version(request.version):
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {request.version}")
+    
+    model_server.load_status[request.version] = 'queued'
+    background_tasks.add_task(_background_load, request)
+    return {"version": request.version, "target": request.target, "status": "queued"}
+
+@app.post("/admin/models/traffic", response_model=Dict, dependencies=[Depends(require_admin)])
+async def set_traffic(request: TrafficSplitRequest):
+    """Change the share of engines routed to the candidate"""
+    try:
+        model_server.set_traffic(request.traffic_percent)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"candidate_traffic_percent": request.traffic_percent}
+
+@app.post("/admin/models/promote", response_model=Dict, dependencies=[Depends(require_admin)])
+async def promote_model():
+    """Promote the candidate to primary and persist it as the active version"""
+    try:
+        state = model_server.promote_candidate()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"primary": state.version}
+
+@app.delete("/admin/models/candidate", response_model=Dict, dependencies=[Depends(require_admin)])
+async def clear_candidate():
+    """Stop routing traffic to the candidate"""
+    if model_server.routing() is None:
+        raise HTTPException(status_code=409, detail="No primary model loaded")
+    model_server.clear_candidate()
+    return {"candidate": None}
+
 @app.get("/ping")
 async def ping():
     """Simple ping endpoint for health monitoring"""
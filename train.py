@@ -3,35 +3,43 @@ Train XGBoost Model for Turbofan Engine RUL Prediction
 
 This script trains the final model on the NASA C-MAPSS dataset
 and saves the model and necessary artifacts for deployment.
+
+Training runs as a pipeline of stages (see pipeline.py). Intermediate
+artifacts are cached by content hash under .cache/pipeline, so a rerun
+only recomputes the stages whose code, parameters or inputs changed, e.g.
+new XGBoost parameters retrain and re-evaluate the model but reuse the
+loaded data, engineered features and fitted scaler.
 """
 
+import argparse
+import os
 import pandas as pd
 import numpy as np
 import pickle
 from pathlib import Path
+from typing import List
 from sklearn.preprocessing import StandardScaler
 from xgboost import XGBRegressor
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
+import features
+import monitoring
+from features import FeatureStore, ROLLING_WINDOW, rolling_feature_names
+from model_registry import ModelRegistry
+from monitoring import build_reference_profile
+from pipeline import CACHE_DIR, Pipeline, Stage
+
 # Constants
 RANDOM_SEED = 42
 DATA_DIR = Path('data/CMaps')
+FEATURE_STORE_DIR = Path('data/feature_store')
 MODEL_DIR = Path('models')
+REGISTRY_DIR = MODEL_DIR / 'registry'
 DATASET = 'FD001'  # Using FD001 for simplicity
-
-# Ensure model directory exists
-MODEL_DIR.mkdir(exist_ok=True)
-
-print("=" * 80)
-print("TURBOFAN ENGINE RUL PREDICTION - MODEL TRAINING")
-print("=" * 80)
-
-# ============================================================================
-# 1. DATA LOADING
-# ============================================================================
-print("\n[1/7] Loading data...")
+VARIANCE_THRESHOLD = 0.01
+N_TOP_SENSORS = 5
 
 # Define column names
 index_names = ['unit_id', 'time_cycles']
@@ -39,212 +47,395 @@ setting_names = ['setting_1', 'setting_2', 'setting_3']
 sensor_names = [f'sensor_{i}' for i in range(1, 22)]
 col_names = index_names + setting_names + sensor_names
 
-# Load datasets
-train_df = pd.read_csv(DATA_DIR / f'train_{DATASET}.txt', sep='\\s+', header=None, names=col_names)
-test_df = pd.read_csv(DATA_DIR / f'test_{DATASET}.txt', sep='\\s+', header=None, names=col_names)
-truth_df = pd.read_csv(DATA_DIR / f'RUL_{DATASET}.txt', sep='\\s+', header=None, names=['RUL'])
+# ============================================================================
+# 1. DATA LOADING
+# ============================================================================
 
-print(f"✓ Training data: {train_df.shape}")
-print(f"✓ Test data: {test_df.shape}")
-print(f"✓ Ground truth: {truth_df.shape}")
+def load_data(data_dir, dataset):
+    """Raw train/test readings and the test ground truth"""
+    data_dir = Path(data_dir)
+    train_raw = pd.read_csv(data_dir / f'train_{dataset}.txt', sep='\\s+', header=None, names=col_names)
+    test_raw = pd.read_csv(data_dir / f'test_{dataset}.txt', sep='\\s+', header=None, names=col_names)
+    truth = pd.read_csv(data_dir / f'RUL_{dataset}.txt', sep='\\s+', header=None, names=['RUL'])
+
+    print(f"✓ Training data: {train_raw.shape}")
+    print(f"✓ Test data: {test_raw.shape}")
+    print(f"✓ Ground truth: {truth.shape}")
+    return {'train_raw': train_raw, 'test_raw': test_raw, 'truth': truth}
 
 # ============================================================================
 # 2. FEATURE ENGINEERING
 # ============================================================================
-print("\n[2/7] Feature engineering...")
-
-# Calculate RUL for training data
-train_df['RUL'] = train_df.groupby('unit_id')['time_cycles'].transform('max') - train_df['time_cycles']
-
-# Calculate RUL for test data
-test_max_cycles = test_df.groupby('unit_id')['time_cycles'].max().reset_index()
-test_max_cycles.columns = ['unit_id', 'max_cycle']
-test_max_cycles['RUL_at_end'] = truth_df['RUL'].values
-test_df = test_df.merge(test_max_cycles, on='unit_id', how='left')
-test_df['RUL'] = test_df['RUL_at_end'] + (test_df['max_cycle'] - test_df['time_cycles'])
-test_df = test_df.drop(['max_cycle', 'RUL_at_end'], axis=1)
-
-print(f"✓ RUL calculated for training and test data")
-
-# Identify low variance features
-feature_cols = setting_names + sensor_names
-variance_threshold = 0.01
-variances = train_df[feature_cols].var()
-low_variance_features = variances[variances < variance_threshold].index.tolist()
-features_to_keep = [f for f in feature_cols if f not in low_variance_features]
-
-print(f"✓ Removed {len(low_variance_features)} low variance features")
-print(f"✓ Keeping {len(features_to_keep)} features")
-
-# Calculate correlations and select top sensors for rolling features
-correlations = train_df[features_to_keep + ['RUL']].corr()['RUL'].drop('RUL').abs().sort_values(ascending=False)
-top_sensors = correlations.head(5).index.tolist()
-print(f"✓ Top sensors for rolling features: {top_sensors}")
-
-# Add rolling features
-def add_rolling_features(df, sensor_cols, window=5):
-    """Add rolling mean and std features for sensors"""
-    df_roll = df.copy()
-    
-    for sensor in sensor_cols:
-        # Rolling mean
-        df_roll[f'{sensor}_rolling_mean'] = df_roll.groupby('unit_id')[sensor].transform(
-            lambda x: x.rolling(window=window, min_periods=1).mean()
-        )
-        
-        # Rolling std
-        df_roll[f'{sensor}_rolling_std'] = df_roll.groupby('unit_id')[sensor].transform(
-            lambda x: x.rolling(window=window, min_periods=1).std()
-        )
-    
-    # Fill NaN in rolling std with 0
-    df_roll = df_roll.fillna(0)
-    
-    return df_roll
-
-train_df_eng = add_rolling_features(train_df, top_sensors, window=5)
-test_df_eng = add_rolling_features(test_df, top_sensors, window=5)
-
-print(f"✓ Added rolling features (window=5)")
-
-# Define all features
-rolling_features = [col for col in train_df_eng.columns if 'rolling' in col]
-all_features = features_to_keep + rolling_features
-
-print(f"✓ Total features for modeling: {len(all_features)}")
+
+def engineer_features(train_raw, test_raw, store_dir, dataset, window):
+    """Rolling features of every sensor, persisted in the feature store"""
+    # Only cycles that are not stored yet get computed, then both sets are read back;
+    # stores written by other feature code or another window are rebuilt on open,
+    # and stores whose readings differ from the raw data are rebuilt by sync
+    store_dir = Path(store_dir)
+    train_store = FeatureStore(store_dir / f'train_{dataset}', window=window)
+    test_store = FeatureStore(store_dir / f'test_{dataset}', window=window)
+    n_new = train_store.sync(train_raw) + test_store.sync(test_raw)
+    train_store.flush()
+    test_store.flush()
+
+    n_rebuilt = train_store.rebuilt + test_store.rebuilt
+    if n_rebuilt:
+        print(f"✓ Feature store: {n_rebuilt} stored cycles re-engineered (feature code or window changed)")
+    print(f"✓ Feature store: {n_new} new or changed cycles engineered, "
+          f"{len(train_store) + len(test_store)} rows read from {store_dir}")
+    return {'train_features': train_store.read(), 'test_features': test_store.read()}
+
+
+def compute_rul(train_features, test_features, truth):
+    """Remaining useful life of every training and test cycle"""
+    # Calculate RUL for training data
+    train_df = train_features.copy()
+    train_df['RUL'] = train_df.groupby('unit_id')['time_cycles'].transform('max') - train_df['time_cycles']
+
+    # Calculate RUL for test data
+    test_max_cycles = test_features.groupby('unit_id')['time_cycles'].max().reset_index()
+    test_max_cycles.columns = ['unit_id', 'max_cycle']
+    test_max_cycles['RUL_at_end'] = truth['RUL'].values
+    test_df = test_features.merge(test_max_cycles, on='unit_id', how='left')
+    test_df['RUL'] = test_df['RUL_at_end'] + (test_df['max_cycle'] - test_df['time_cycles'])
+    test_df = test_df.drop(['max_cycle', 'RUL_at_end'], axis=1)
+
+    print(f"✓ RUL calculated for training and test data")
+    return {'train_df': train_df, 'test_df': test_df}
+
+
+def select_features(train_df, variance_threshold, n_top_sensors, window):
+    """Drop low variance features and pick the top sensors for rolling features"""
+    feature_cols = setting_names + sensor_names
+    variances = train_df[feature_cols].var()
+    low_variance_features = variances[variances < variance_threshold].index.tolist()
+    features_to_keep = [f for f in feature_cols if f not in low_variance_features]
+
+    print(f"✓ Removed {len(low_variance_features)} low variance features")
+    print(f"✓ Keeping {len(features_to_keep)} features")
+
+    # Calculate correlations and select top sensors for rolling features
+    correlations = train_df[features_to_keep + ['RUL']].corr()['RUL'].drop('RUL').abs().sort_values(ascending=False)
+    top_sensors = correlations.head(n_top_sensors).index.tolist()
+    print(f"✓ Top sensors for rolling features: {top_sensors}")
+
+    # Rolling features of the top sensors come precomputed from the feature store
+    print(f"✓ Using rolling features (window={window})")
+    all_features = features_to_keep + rolling_feature_names(top_sensors)
+    print(f"✓ Total features for modeling: {len(all_features)}")
+
+    return {'selection': {
+        'feature_cols': feature_cols,
+        'low_variance_features': low_variance_features,
+        'variance_threshold': variance_threshold,
+        'features_to_keep': features_to_keep,
+        'top_sensors': top_sensors,
+        'all_features': all_features,
+    }}
 
 # ============================================================================
 # 3. DATA PREPARATION
 # ============================================================================
-print("\n[3/7] Preparing data...")
-
-X_train = train_df_eng[all_features]
-y_train = train_df_eng['RUL']
-X_test = test_df_eng[all_features]
-y_test = test_df_eng['RUL']
 
-print(f"✓ Training set: {X_train.shape}")
-print(f"✓ Test set: {X_test.shape}")
+def prepare_data(train_df, test_df, selection, model_family):
+    """Model inputs and targets"""
+    if model_family == 'sequence':
+        # Sequence models window over the raw readings of each unit
+        model_cols = index_names + selection['features_to_keep']
+    else:
+        model_cols = selection['all_features']
+
+    X_train = train_df[model_cols]
+    X_test = test_df[model_cols]
+    print(f"✓ Training set: {X_train.shape}")
+    print(f"✓ Test set: {X_test.shape}")
+    return {'X_train': X_train, 'y_train': train_df['RUL'],
+            'X_test': X_test, 'y_test': test_df['RUL']}
 
 # ============================================================================
 # 4. FEATURE SCALING
 # ============================================================================
-print("\n[4/7] Scaling features...")
 
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-
-print("✓ Features scaled using StandardScaler")
+def fit_scaler(train_df, selection):
+    """StandardScaler over the engineered features"""
+    scaler = StandardScaler()
+    scaler.fit(train_df[selection['all_features']])
+    print("✓ Features scaled using StandardScaler")
+    return {'scaler': scaler}
 
 # ============================================================================
 # 5. MODEL TRAINING
 # ============================================================================
-print("\n[5/7] Training XGBoost model...")
 
-# Best parameters (from hyperparameter tuning)
-# You can adjust these based on your tuning results
-best_params = {
-    'n_estimators': 200,
-    'max_depth': 5,
-    'learning_rate': 0.1,
-    'subsample': 0.8,
-    'random_state': RANDOM_SEED,
-    'n_jobs': -1
-}
+def train_model(X_train, y_train, selection, model_family, best_params):
+    """Fit the XGBoost or sequence-window model"""
+    if model_family == 'sequence':
+        from sequence_model import SequenceRULModel
 
-model = XGBRegressor(**best_params)
-model.fit(X_train, y_train)
+        print(f"✓ Training sequence model ({best_params['arch'].upper()}, "
+              f"window={best_params['seq_len']})")
+        model = SequenceRULModel(selection['features_to_keep'], seq_len=best_params['seq_len'],
+                                 arch=best_params['arch'], random_state=best_params['random_state'])
+        model.fit(X_train, y_train, epochs=best_params['epochs'])
+    else:
+        print("✓ Training XGBoost model")
+        model = XGBRegressor(**best_params)
+        model.fit(X_train, y_train)
 
-print("✓ Model training completed")
+    print("✓ Model training completed")
+    return {'model': model}
 
 # ============================================================================
 # 6. MODEL EVALUATION
 # ============================================================================
-print("\n[6/7] Evaluating model...")
-
-# Training predictions
-y_train_pred = model.predict(X_train)
-train_rmse = np.sqrt(mean_squared_error(y_train, y_train_pred))
-train_mae = mean_absolute_error(y_train, y_train_pred)
-train_r2 = r2_score(y_train, y_train_pred)
 
-# Test predictions
-y_test_pred = model.predict(X_test)
-test_rmse = np.sqrt(mean_squared_error(y_test, y_test_pred))
-test_mae = mean_absolute_error(y_test, y_test_pred)
-test_r2 = r2_score(y_test, y_test_pred)
+def evaluate(model, X_train, y_train, X_test, y_test):
+    """Train/test RMSE, MAE and R²"""
+    # Training predictions
+    y_train_pred = model.predict(X_train)
+    # Test predictions
+    y_test_pred = model.predict(X_test)
+
+    metrics = {
+        'train_rmse': float(np.sqrt(mean_squared_error(y_train, y_train_pred))),
+        'train_mae': float(mean_absolute_error(y_train, y_train_pred)),
+        'train_r2': float(r2_score(y_train, y_train_pred)),
+        'test_rmse': float(np.sqrt(mean_squared_error(y_test, y_test_pred))),
+        'test_mae': float(mean_absolute_error(y_test, y_test_pred)),
+        'test_r2': float(r2_score(y_test, y_test_pred)),
+    }
+    print("✓ Model evaluated on training and test data")
+    return {'metrics': metrics, 'y_train_pred': y_train_pred}
+
+
+def reference_profile(train_df, selection, y_train_pred):
+    """Training distribution of the inputs and predictions, for drift monitoring"""
+    profile = build_reference_profile(
+        train_df, selection['feature_cols'], y_train_pred,
+        selection['low_variance_features'], selection['variance_threshold']
+    )
+    print(f"✓ Reference profile of {len(profile['features'])} features")
+    return {'reference_profile': profile}
 
-print("\n" + "=" * 80)
-print("MODEL PERFORMANCE")
-print("=" * 80)
-print(f"\nTraining Metrics:")
-print(f"  RMSE: {train_rmse:.4f}")
-print(f"  MAE:  {train_mae:.4f}")
-print(f"  R²:   {train_r2:.4f}")
+# ============================================================================
+# 7. SAVE MODEL AND ARTIFACTS
+# ============================================================================
 
-print(f"\nTest Metrics:")
-print(f"  RMSE: {test_rmse:.4f}")
-print(f"  MAE:  {test_mae:.4f}")
-print(f"  R²:   {test_r2:.4f}")
-print("=" * 80)
+def save_artifacts(model, scaler, selection, metrics, reference_profile,
+                   model_family, best_params, dataset, seq_len):
+    """Publish the trained model as a registry version"""
+    registry = ModelRegistry(REGISTRY_DIR, fallback_dir=MODEL_DIR)
+    model_features = selection['features_to_keep'] if model_family == 'sequence' else selection['all_features']
+
+    # Model metadata
+    metadata = {
+        'model_type': f"Sequence{best_params['arch'].upper()}" if model_family == 'sequence' else 'XGBoost',
+        'dataset': dataset,
+        'n_features': len(model_features),
+        'features': model_features,
+        'low_variance_features': selection['low_variance_features'],
+        'top_sensors': selection['top_sensors'],
+        'best_params': best_params,
+        **metrics,
+        'training_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'model_version': registry.new_version(),
+        # Training distribution of the inputs and predictions, for drift monitoring
+        'reference_profile': reference_profile
+    }
+
+    # Configuration for prediction service
+    config = {
+        'model_family': model_family,
+        'features_to_keep': selection['features_to_keep'],
+        'top_sensors': selection['top_sensors'],
+        'rolling_window': ROLLING_WINDOW,
+        'all_features': model_features
+    }
+    if model_family == 'sequence':
+        config['sequence_length'] = seq_len
+
+    # Publish a versioned bundle to the registry
+    model_version = registry.publish(
+        {'model': model, 'scaler': scaler, 'config': config, 'metadata': metadata},
+        version=metadata['model_version']
+    )
+    print(f"✓ Registered model version {model_version} in {REGISTRY_DIR}")
+    return {'model_version': model_version}
+
+
+def activate(model_version, model_family):
+    """Serve a published version: flat deployment artifacts and the ACTIVE pointer"""
+    # Never cached: a rerun that reuses an older published version (e.g. after
+    # reverting a parameter) must still make that version the deployed one
+    registry = ModelRegistry(REGISTRY_DIR, fallback_dir=MODEL_DIR)
+    if model_family != 'xgboost':
+        # Sequence models are rolled out as a canary next to the active model
+        print(f"  Try it as a canary: POST /admin/models/load "
+              f"{{\"version\": \"{model_version}\", \"target\": \"candidate\"}}")
+        return {'active_version': registry.active_version()}
+
+    bundle = registry.load(model_version)
+    MODEL_DIR.mkdir(exist_ok=True)
+    flat_artifacts = [
+        ('xgboost_rul_model.pkl', bundle.model, 'Model'),
+        ('scaler.pkl', bundle.scaler, 'Scaler'),
+        ('feature_names.pkl', bundle.config['all_features'], 'Feature names'),
+        ('model_metadata.pkl', bundle.metadata, 'Metadata'),
+        ('config.pkl', bundle.config, 'Configuration'),
+    ]
+    for filename, artifact, label in flat_artifacts:
+        with open(MODEL_DIR / filename, 'wb') as f:
+            pickle.dump(artifact, f)
+        print(f"✓ {label} saved to {MODEL_DIR / filename}")
+
+    # A running service watching the registry hot-loads it without a restart
+    registry.set_active(model_version)
+    print(f"✓ Model version {model_version} is now active")
+    return {'active_version': model_version}
 
 # ============================================================================
-# 7. SAVE MODEL AND ARTIFACTS
+# PIPELINE
 # ============================================================================
-print("\n[7/7] Saving model and artifacts...")
-
-# Save the model
-with open(MODEL_DIR / 'xgboost_rul_model.pkl', 'wb') as f:
-    pickle.dump(model, f)
-print(f"✓ Model saved to {MODEL_DIR / 'xgboost_rul_model.pkl'}")
-
-# Save the scaler
-with open(MODEL_DIR / 'scaler.pkl', 'wb') as f:
-    pickle.dump(scaler, f)
-print(f"✓ Scaler saved to {MODEL_DIR / 'scaler.pkl'}")
-
-# Save feature names
-with open(MODEL_DIR / 'feature_names.pkl', 'wb') as f:
-    pickle.dump(all_features, f)
-print(f"✓ Feature names saved to {MODEL_DIR / 'feature_names.pkl'}")
-
-# Save model metadata
-metadata = {
-    'model_type': 'XGBoost',
-    'dataset': DATASET,
-    'n_features': len(all_features),
-    'features': all_features,
-    'low_variance_features': low_variance_features,
-    'top_sensors': top_sensors,
-    'best_params': best_params,
-    'train_rmse': float(train_rmse),
-    'train_mae': float(train_mae),
-    'train_r2': float(train_r2),
-    'test_rmse': float(test_rmse),
-    'test_mae': float(test_mae),
-    'test_r2': float(test_r2),
-    'training_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
-}
-
-with open(MODEL_DIR / 'model_metadata.pkl', 'wb') as f:
-    pickle.dump(metadata, f)
-print(f"✓ Metadata saved to {MODEL_DIR / 'model_metadata.pkl'}")
-
-# Save configuration for prediction service
-config = {
-    'features_to_keep': features_to_keep,
-    'top_sensors': top_sensors,
-    'rolling_window': 5,
-    'all_features': all_features
-}
-
-with open(MODEL_DIR / 'config.pkl', 'wb') as f:
-    pickle.dump(config, f)
-print(f"✓ Configuration saved to {MODEL_DIR / 'config.pkl'}")
-
-print("\n" + "=" * 80)
-print("✅ TRAINING COMPLETED SUCCESSFULLY!")
-print("=" * 80)
-print(f"\nModel artifacts saved in: {MODEL_DIR.absolute()}")
-print("\nYou can now use the model for predictions using predict.py")
+
+def publish_stages(model_family, best_params, seq_len) -> List[Stage]:
+    """Stages that publish the trained model and make it the served version"""
+    return [
+        # An unchanged run reuses the version it published (while it still exists)
+        # instead of publishing a duplicate and triggering a hot reload
+        Stage('save_artifacts', save_artifacts,
+              inputs=['model', 'scaler', 'selection', 'metrics', 'reference_profile'],
+              outputs=['model_version'],
+              params={'model_family': model_family, 'best_params': best_params,
+                      'dataset': DATASET, 'seq_len': seq_len},
+              valid=lambda outputs: ModelRegistry(REGISTRY_DIR).has_version(outputs['model_version'])),
+        Stage('activate', activate,
+              inputs=['model_version'],
+              outputs=['active_version'],
+              params={'model_family': model_family},
+              cache=False),
+    ]
+
+
+def build_pipeline(args) -> Pipeline:
+    """Training stages wired by their inputs and outputs"""
+    if args.model == 'sequence':
+        best_params = {
+            'arch': args.arch,
+            'seq_len': args.seq_len,
+            'epochs': args.epochs,
+            'random_state': RANDOM_SEED
+        }
+        model_files = [Path('sequence_model.py')]
+    else:
+        # Best parameters (from hyperparameter tuning)
+        # You can adjust these based on your tuning results
+        best_params = {
+            'n_estimators': 200,
+            'max_depth': 5,
+            'learning_rate': 0.1,
+            'subsample': 0.8,
+            'random_state': RANDOM_SEED,
+            'n_jobs': -1
+        }
+        model_files = []
+
+    stages = [
+        Stage('load_data', load_data,
+              outputs=['train_raw', 'test_raw', 'truth'],
+              params={'data_dir': str(DATA_DIR), 'dataset': DATASET},
+              files=[DATA_DIR / f'{split}_{DATASET}.txt' for split in ('train', 'test', 'RUL')]),
+        Stage('engineer_features', engineer_features,
+              inputs=['train_raw', 'test_raw'],
+              outputs=['train_features', 'test_features'],
+              params={'store_dir': str(FEATURE_STORE_DIR), 'dataset': DATASET, 'window': ROLLING_WINDOW},
+              files=[Path(features.__file__)]),
+        Stage('compute_rul', compute_rul,
+              inputs=['train_features', 'test_features', 'truth'],
+              outputs=['train_df', 'test_df']),
+        Stage('select_features', select_features,
+              inputs=['train_df'],
+              outputs=['selection'],
+              params={'variance_threshold': VARIANCE_THRESHOLD, 'n_top_sensors': N_TOP_SENSORS,
+                      'window': ROLLING_WINDOW}),
+        Stage('prepare_data', prepare_data,
+              inputs=['train_df', 'test_df', 'selection'],
+              outputs=['X_train', 'y_train', 'X_test', 'y_test'],
+              params={'model_family': args.model}),
+        Stage('fit_scaler', fit_scaler,
+              inputs=['train_df', 'selection'],
+              outputs=['scaler']),
+        Stage('train_model', train_model,
+              inputs=['X_train', 'y_train', 'selection'],
+              outputs=['model'],
+              params={'model_family': args.model, 'best_params': best_params},
+              files=model_files),
+        Stage('evaluate', evaluate,
+              inputs=['model', 'X_train', 'y_train', 'X_test', 'y_test'],
+              outputs=['metrics', 'y_train_pred']),
+        Stage('reference_profile', reference_profile,
+              inputs=['train_df', 'selection', 'y_train_pred'],
+              outputs=['reference_profile'],
+              files=[Path(monitoring.__file__)]),
+        *publish_stages(args.model, best_params, args.seq_len),
+    ]
+    return Pipeline(stages, cache_dir=args.cache_dir, use_cache=not args.no_cache,
+                    max_workers=args.workers)
+
+
+def main():
+    # Command line options
+    parser = argparse.ArgumentParser(description="Train the Turbofan RUL model")
+    parser.add_argument('--model', choices=['xgboost', 'sequence'], default='xgboost',
+                        help="Model family: XGBoost on rolling features, or a 1D-CNN/GRU over cycle windows")
+    parser.add_argument('--arch', choices=['cnn', 'gru'], default='cnn',
+                        help="Sequence model architecture (only with --model sequence)")
+    parser.add_argument('--seq-len', type=int, default=30,
+                        help="Number of past cycles per window (only with --model sequence)")
+    parser.add_argument('--epochs', type=int, default=15,
+                        help="Training epochs (only with --model sequence)")
+    parser.add_argument('--cache-dir', type=Path, default=CACHE_DIR,
+                        help="Directory of cached stage outputs")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Recompute every stage (results are still written to the cache)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Maximum number of stages running in parallel")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("TURBOFAN ENGINE RUL PREDICTION - MODEL TRAINING")
+    print("=" * 80)
+
+    pipeline = build_pipeline(args)
+    artifacts = pipeline.run(['evaluate', 'activate'])
+    metrics = artifacts['metrics']
+    if pipeline.stats['save_artifacts'].status == 'cached':
+        print(f"\n✓ Nothing changed since model version {artifacts['model_version']}; not republished")
+
+    print("\n" + "=" * 80)
+    print("MODEL PERFORMANCE")
+    print("=" * 80)
+    print(f"\nTraining Metrics:")
+    print(f"  RMSE: {metrics['train_rmse']:.4f}")
+    print(f"  MAE:  {metrics['train_mae']:.4f}")
+    print(f"  R²:   {metrics['train_r2']:.4f}")
+
+    print(f"\nTest Metrics:")
+    print(f"  RMSE: {metrics['test_rmse']:.4f}")
+    print(f"  MAE:  {metrics['test_mae']:.4f}")
+    print(f"  R²:   {metrics['test_r2']:.4f}")
+    print("=" * 80)
+
+    print("\nPIPELINE STAGES")
+    print(pipeline.report())
+    pipeline.save_report(args.cache_dir / 'last_run.json')
+
+    print("\n" + "=" * 80)
+    print("✅ TRAINING COMPLETED SUCCESSFULLY!")
+    print("=" * 80)
+    print(f"\nModel artifacts saved in: {MODEL_DIR.absolute()}")
+    print("\nYou can now use the model for predictions using predict.py")
+
+
+if __name__ == "__main__":
+    main()